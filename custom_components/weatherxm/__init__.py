@@ -5,14 +5,25 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import CONF_DEVICE_ID
+from .account import async_get_account
+from .api import WxmApi
+from .budget import async_get_budget
+from .const import CONF_DEVICE_ID, CONF_PUSH_URL, DOMAIN
 from .entities import (
     WxmCoordinator,
     WxmCoordinators,
     WxmForecastCoordinator,
     WxmRewardsCoordinator,
+    aggregates_store,
 )
+from .rewards_statistics import RewardsStatistics
+from .services import async_setup_services
+from .transport import WebSocketTransport
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -21,33 +32,41 @@ PLATFORMS: list[Platform] = [
 ]
 
 
+async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
+    """Set up the WeatherXM integration."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry[WxmCoordinators]
 ) -> bool:
     """Set up the WeatherXM connection."""
     refresh_token = entry.data[CONF_ACCESS_TOKEN]
     device_id = entry.data[CONF_DEVICE_ID]
-    wxm_client = pywxm.WxmClient(
-        session=aiohttp_client.async_get_clientsession(hass),
-        refresh_token=refresh_token,
-    )
-    wxm_api = pywxm.WxmApi(wxm_client)
+    account = async_get_account(hass, entry)
+    await account.usage.async_load()
+    wxm_client = pywxm.WxmClient(session=account.session, refresh_token=refresh_token)
+    wxm_api = WxmApi(wxm_client)
     device_coordinator = WxmCoordinator(
         hass=hass,
         config_entry=entry,
         wxm_api=wxm_api,
+        account=account,
         device_id=device_id,
     )
     rewards_coordinator = WxmRewardsCoordinator(
         hass=hass,
         config_entry=entry,
         wxm_api=wxm_api,
+        account=account,
         device_id=device_id,
     )
     forecast_coordinator = WxmForecastCoordinator(
         hass=hass,
         config_entry=entry,
         wxm_api=wxm_api,
+        account=account,
         device_id=device_id,
     )
     entry.runtime_data = WxmCoordinators(
@@ -65,11 +84,63 @@ async def async_setup_entry(
 
     await wxm_client.subscribe_refresh_token(_async_on_token_update)
 
-    # Authenticate and load initial weather station data.
+    # Authenticate and load initial weather station data. Forecasts aren't loaded
+    # until they are requested.
     await device_coordinator.async_config_entry_first_refresh()
     await rewards_coordinator.async_config_entry_first_refresh()
-    await forecast_coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    RewardsStatistics(hass, entry.runtime_data).async_start()
+    entry.async_on_unload(async_get_budget(hass, account).async_add_entry(entry))
+
+    await _async_apply_options(hass, entry)
+    entry.async_on_unload(entry.add_update_listener(_async_apply_options))
 
     return True
+
+
+async def async_unload_entry(
+    hass: HomeAssistant, entry: ConfigEntry[WxmCoordinators]
+) -> bool:
+    """Unload the WeatherXM connection."""
+    await entry.runtime_data.device.async_set_transport(None)
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def _async_apply_options(
+    hass: HomeAssistant, entry: ConfigEntry[WxmCoordinators]
+) -> None:
+    """Apply the configuration entry options to the running integration."""
+    device_coordinator = entry.runtime_data.device
+    # The budget is shared by the account, so applies the poll intervals of all of
+    # the account's weather stations.
+    async_get_budget(hass, device_coordinator.account).async_update()
+
+    # The listener is also called for refresh token updates, so avoid needlessly
+    # restarting the push transport.
+    push_url = entry.options.get(CONF_PUSH_URL)
+    current_transport = device_coordinator.transport
+    if isinstance(current_transport, WebSocketTransport):
+        current_push_url = current_transport.url
+    else:
+        current_push_url = None
+    if push_url == current_push_url:
+        return
+
+    transport = None
+    if push_url:
+        transport = WebSocketTransport(
+            hass=hass,
+            config_entry=entry,
+            session=aiohttp_client.async_get_clientsession(hass),
+            url=push_url,
+            device_id=device_coordinator.device_id,
+        )
+    await device_coordinator.async_set_transport(transport)
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: ConfigEntry[WxmCoordinators]
+) -> None:
+    """Remove persisted data when the WeatherXM connection is deleted."""
+    await aggregates_store(hass, entry).async_remove()
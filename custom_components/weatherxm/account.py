@@ -0,0 +1,227 @@
+"""Shared state for each WeatherXM account.
+
+A WeatherXM account may be used by several config entries, one per weather station,
+which all share the same account state.
+"""
+
+import asyncio
+import contextlib
+import datetime
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
+from typing import Any
+
+import aiohttp
+import pywxm
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .session import async_create_session
+from .usage import ApiUsage, usage_store
+
+_LOGGER = logging.getLogger(__name__)
+
+# Limits the requests in flight for each account, so many stations refreshing at
+# once queue rather than opening a burst of connections.
+_MAX_CONCURRENT_REQUESTS = 4
+
+_DATA_ACCOUNTS: HassKey[dict[str, "WxmAccount"]] = HassKey(DOMAIN)
+
+
+class WxmRequestError(HomeAssistantError):
+    """A request to the WeatherXM API wasn't allowed, or failed."""
+
+
+class BreakerState(StrEnum):
+    """The state of a circuit breaker."""
+
+    CLOSED = "closed"
+    """Requests are allowed."""
+    OPEN = "open"
+    """Requests are rejected until the reset timeout has elapsed."""
+    HALF_OPEN = "half_open"
+    """A single probe request is in progress to test whether the API recovered."""
+
+
+class CircuitBreaker:
+    """Stops requests to the WeatherXM API while it is failing.
+
+    The breaker opens after several consecutive failures. Once the reset timeout
+    elapses a single probe request is allowed. The breaker closes if the probe
+    succeeds, otherwise it opens again with a longer reset timeout. A probe whose
+    outcome is never recorded, such as a cancelled request, expires after the reset
+    timeout so another probe can be made.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout: datetime.timedelta = datetime.timedelta(minutes=1),
+        max_reset_timeout: datetime.timedelta = datetime.timedelta(minutes=30),
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._initial_reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at: datetime.datetime | None = None
+        self._probe_started_at: datetime.datetime | None = None
+
+    @callback
+    def allow_request(self) -> bool:
+        """Return whether a request to the API may be made.
+
+        Every allowed request must be followed by a call to record_success or
+        record_failure.
+        """
+        now = dt_util.utcnow()
+        match self.state:
+            case BreakerState.CLOSED:
+                return True
+            case BreakerState.OPEN if (
+                self._opened_at is not None
+                and now - self._opened_at >= self._reset_timeout
+            ):
+                _LOGGER.debug("Circuit breaker half-open, probing WeatherXM API")
+                self.state = BreakerState.HALF_OPEN
+                self._probe_started_at = now
+                return True
+            case BreakerState.HALF_OPEN if (
+                self._probe_started_at is not None
+                and now - self._probe_started_at >= self._reset_timeout
+            ):
+                _LOGGER.debug("Circuit breaker probe expired, probing again")
+                self._probe_started_at = now
+                return True
+            case _:
+                return False
+
+    @callback
+    def record_success(self) -> None:
+        """Record a request which reached the API successfully."""
+        if self.state != BreakerState.CLOSED:
+            _LOGGER.info("WeatherXM API recovered, circuit breaker closed")
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+        self._reset_timeout = self._initial_reset_timeout
+        self._opened_at = None
+        self._probe_started_at = None
+
+    @callback
+    def record_failure(self) -> None:
+        """Record a request which failed."""
+        self._failures += 1
+        if self.state == BreakerState.HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self._max_reset_timeout)
+        elif self._failures < self._failure_threshold:
+            return
+
+        _LOGGER.warning(
+            "WeatherXM API is failing, pausing requests for %s", self._reset_timeout
+        )
+        self.state = BreakerState.OPEN
+        self._opened_at = dt_util.utcnow()
+        self._probe_started_at = None
+
+
+@dataclass
+class WxmAccount:
+    """State shared by all config entries using the same WeatherXM account."""
+
+    account_id: str
+    session: aiohttp.ClientSession
+    """Session for requests to the WeatherXM API."""
+    usage: ApiUsage
+    """Counts the requests made by the session."""
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    request_semaphore: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+    )
+    """Limits the number of concurrent requests to the WeatherXM API."""
+
+    @contextlib.asynccontextmanager
+    async def async_request(self) -> AsyncIterator[None]:
+        """Make requests to the API within the daily budget and circuit breaker.
+
+        The outcome of the requests made in the context is recorded on the circuit
+        breaker, including errors parsing their responses.
+
+        Raises:
+            WxmRequestError: If requests aren't allowed, or they failed.
+            pywxm.AuthenticationError: If the API rejected the account's tokens.
+        """
+        if self.usage.exhausted:
+            raise WxmRequestError("Daily WeatherXM API request budget exhausted")
+        if not self.breaker.allow_request():
+            raise WxmRequestError("WeatherXM API requests are paused")
+
+        try:
+            async with self.request_semaphore:
+                yield
+        except pywxm.AuthenticationError:
+            # The API itself is responding
+            self.breaker.record_success()
+            raise
+        except pywxm.UnexpectedError as e:
+            self.breaker.record_failure()
+            raise WxmRequestError(
+                f"Error communicating with WeatherXM: {e.message}"
+            ) from e
+        except (aiohttp.ClientError, TimeoutError) as e:
+            self.breaker.record_failure()
+            raise WxmRequestError(f"Error communicating with WeatherXM: {e}") from e
+        except (ValueError, KeyError) as e:
+            # pywxm raises ValueError for bad requests, and both are raised when
+            # parsing unexpected responses.
+            self.breaker.record_failure()
+            raise WxmRequestError(f"Unexpected response from WeatherXM: {e!r}") from e
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+
+@callback
+def async_get_account(hass: HomeAssistant, entry: ConfigEntry[Any]) -> WxmAccount:
+    """Return the shared account state for a config entry."""
+    # Entries created before the username was recorded can't be matched to other
+    # entries, so they are treated as separate accounts.
+    return async_get_account_by_id(hass, entry.data.get(CONF_USERNAME, entry.entry_id))
+
+
+@callback
+def async_get_account_by_id(hass: HomeAssistant, account_id: str) -> WxmAccount:
+    """Return the shared account state for a (lower case) WeatherXM username."""
+    accounts: dict[str, WxmAccount] | None = hass.data.get(_DATA_ACCOUNTS)
+    if accounts is None:
+        accounts = hass.data[_DATA_ACCOUNTS] = {}
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, partial(_async_close_sessions, accounts)
+        )
+
+    account: WxmAccount | None = accounts.get(account_id)
+    if account is None:
+        usage = ApiUsage(usage_store(hass, account_id))
+        account = accounts[account_id] = WxmAccount(
+            account_id,
+            session=async_create_session(hass, trace_configs=[usage.trace_config()]),
+            usage=usage,
+        )
+    return account
+
+
+async def _async_close_sessions(accounts: dict[str, WxmAccount], _: Event) -> None:
+    """Close the sessions of all accounts when Home Assistant stops."""
+    for account in accounts.values():
+        await account.session.close()
@@ -0,0 +1,213 @@
+"""Rolling aggregates computed from polled weather observations.
+
+Samples are held in small bounded ring buffers, so each new observation updates the
+aggregates in constant (amortised) time without needing to query the recorder.
+"""
+
+import datetime
+from collections import deque
+from typing import Any
+
+import pywxm
+
+# Observations are typically reported every 5 minutes, so this leaves plenty of
+# headroom for stations reporting more frequently.
+_MAX_SAMPLES_PER_HOUR = 60
+
+Sample = tuple[float, float]
+"""A (POSIX timestamp, value) pair."""
+
+
+class RollingWindow:
+    """Bounded ring buffer of samples covering a fixed time window.
+
+    Subclasses maintain their aggregate incrementally as samples are added and
+    evicted.
+    """
+
+    def __init__(self, window: datetime.timedelta) -> None:
+        self._window_seconds = window.total_seconds()
+        self._maxlen = max(
+            1, int(window / datetime.timedelta(hours=1) * _MAX_SAMPLES_PER_HOUR)
+        )
+        self._samples: deque[Sample] = deque()
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a new sample and evict any samples which are outside the window."""
+        if len(self._samples) == self._maxlen:
+            self._evicted(self._samples.popleft())
+        sample = (timestamp, value)
+        self._samples.append(sample)
+        self._added(sample)
+        self.evict(timestamp)
+
+    def evict(self, now: float) -> bool:
+        """Evict any samples which are outside the window ending at a POSIX timestamp.
+
+        Returns:
+            True if any samples were evicted.
+        """
+        cutoff = now - self._window_seconds
+        evicted = False
+        while self._samples and self._samples[0][0] < cutoff:
+            self._evicted(self._samples.popleft())
+            evicted = True
+        return evicted
+
+    @property
+    def samples(self) -> list[Sample]:
+        """The samples currently in the window, from oldest to newest."""
+        return list(self._samples)
+
+    def _added(self, sample: Sample) -> None:
+        """Update the aggregate for a newly added sample."""
+
+    def _evicted(self, sample: Sample) -> None:
+        """Update the aggregate for a sample removed from the window."""
+
+
+class RollingSum(RollingWindow):
+    """The sum of all sample values within the window."""
+
+    def __init__(self, window: datetime.timedelta) -> None:
+        super().__init__(window)
+        self._total = 0.0
+
+    @property
+    def value(self) -> float | None:
+        """The current sum, or None if there are no samples."""
+        return self._total if self._samples else None
+
+    def _added(self, sample: Sample) -> None:
+        self._total += sample[1]
+
+    def _evicted(self, sample: Sample) -> None:
+        self._total -= sample[1]
+
+
+class RollingMax(RollingWindow):
+    """The maximum sample value within the window."""
+
+    def __init__(self, window: datetime.timedelta) -> None:
+        super().__init__(window)
+        # Monotonically decreasing candidates for the maximum value.
+        self._candidates: deque[Sample] = deque()
+
+    @property
+    def value(self) -> float | None:
+        """The current maximum, or None if there are no samples."""
+        return self._candidates[0][1] if self._candidates else None
+
+    def _added(self, sample: Sample) -> None:
+        while self._candidates and self._candidates[-1][1] <= sample[1]:
+            self._candidates.pop()
+        self._candidates.append(sample)
+
+    def _evicted(self, sample: Sample) -> None:
+        if self._candidates and self._candidates[0] is sample:
+            self._candidates.popleft()
+
+
+class RollingChange(RollingWindow):
+    """The change between the oldest and newest sample values within the window."""
+
+    @property
+    def value(self) -> float | None:
+        """The current change, or None if there are no samples."""
+        if not self._samples:
+            return None
+        return self._samples[-1][1] - self._samples[0][1]
+
+
+class ObservationAggregates:
+    """Rolling aggregates for the observations of a single weather station."""
+
+    def __init__(
+        self,
+        *,
+        last_timestamp: float | None = None,
+        last_precipitation_accumulated: float | None = None,
+        last_date: int | None = None,
+    ) -> None:
+        self.max_wind_gust = RollingMax(datetime.timedelta(hours=1))
+        self.precipitation = RollingSum(datetime.timedelta(hours=24))
+        self.pressure_change = RollingChange(datetime.timedelta(hours=3))
+
+        self._last_timestamp = last_timestamp
+        self._last_precipitation_accumulated = last_precipitation_accumulated
+        self._last_date = last_date
+
+    def add(self, observation: pywxm.HourlyWeatherData) -> bool:
+        """Add a new observation to the aggregates.
+
+        Returns:
+            True if the aggregates were updated, or False if the observation had
+            already been added.
+        """
+        timestamp = observation.timestamp.timestamp()
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            return False
+
+        # The station reports the precipitation accumulated since local midnight,
+        # so convert it back into the precipitation since the previous observation.
+        accumulated = observation.precipitation_accumulated
+        date = observation.timestamp.date().toordinal()
+        if self._last_precipitation_accumulated is None:
+            precipitation = 0.0
+        elif date != self._last_date or accumulated < (
+            self._last_precipitation_accumulated
+        ):
+            precipitation = accumulated
+        else:
+            precipitation = accumulated - self._last_precipitation_accumulated
+
+        self.max_wind_gust.append(timestamp, observation.wind_gust)
+        self.precipitation.append(timestamp, precipitation)
+        self.pressure_change.append(timestamp, observation.absolute_pressure)
+
+        self._last_timestamp = timestamp
+        self._last_precipitation_accumulated = accumulated
+        self._last_date = date
+        return True
+
+    def evict(self, now: float) -> bool:
+        """Evict samples which have aged out of the windows at a POSIX timestamp.
+
+        Windows are otherwise only updated when observations are added, so this
+        stops old values being reported when a station stops reporting.
+
+        Returns:
+            True if any of the aggregates changed.
+        """
+        evicted = [
+            window.evict(now)
+            for window in (self.max_wind_gust, self.precipitation, self.pressure_change)
+        ]
+        return any(evicted)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialise the aggregates so they can be restored after a restart."""
+        return {
+            "max_wind_gust": self.max_wind_gust.samples,
+            "precipitation": self.precipitation.samples,
+            "pressure_change": self.pressure_change.samples,
+            "last_timestamp": self._last_timestamp,
+            "last_precipitation_accumulated": self._last_precipitation_accumulated,
+            "last_date": self._last_date,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ObservationAggregates":
+        """Restore aggregates previously serialised with as_dict."""
+        aggregates = cls(
+            last_timestamp=data["last_timestamp"],
+            last_precipitation_accumulated=data["last_precipitation_accumulated"],
+            last_date=data["last_date"],
+        )
+        for timestamp, value in data["max_wind_gust"]:
+            aggregates.max_wind_gust.append(timestamp, value)
+        for timestamp, value in data["precipitation"]:
+            aggregates.precipitation.append(timestamp, value)
+        for timestamp, value in data["pressure_change"]:
+            aggregates.pressure_change.append(timestamp, value)
+        return aggregates
@@ -0,0 +1,49 @@
+"""WeatherXM API requests which pywxm doesn't provide."""
+
+import datetime
+from typing import Any
+
+import pywxm
+
+
+class WxmApi(pywxm.WxmApi):
+    """Extends the pywxm API with the endpoints used only by the integration."""
+
+    async def get_forecast_payload(
+        self, device_id: str, from_date: datetime.date, to_date: datetime.date
+    ) -> bytes:
+        """Get the unparsed forecast response for a WeatherXM device.
+
+        The response is returned as bytes so that it can be parsed outside the
+        event loop.
+        """
+        params = {"fromDate": from_date.isoformat(), "toDate": to_date.isoformat()}
+        async with await self.client.get(
+            f"me/devices/{device_id}/forecast", params=params
+        ) as resp:
+            await self._raise_if_error(resp)
+            return await resp.read()
+
+    async def get_history(
+        self, device_id: str, from_date: datetime.date, to_date: datetime.date
+    ) -> list[dict[str, Any]]:
+        """Get the observations reported by a WeatherXM device on each date."""
+        params = {"fromDate": from_date.isoformat(), "toDate": to_date.isoformat()}
+        async with await self.client.get(
+            f"me/devices/{device_id}/history", params=params
+        ) as resp:
+            await self._raise_if_error(resp)
+            history: list[dict[str, Any]] = await resp.json()
+            return history
+
+    async def get_rewards_timeline(
+        self, device_id: str, page: int, page_size: int
+    ) -> dict[str, Any]:
+        """Get a page of the rewards earned by a WeatherXM device, newest first."""
+        params = {"page": page, "pageSize": page_size}
+        async with await self.client.get(
+            f"devices/{device_id}/rewards/timeline", params=params
+        ) as resp:
+            await self._raise_if_error(resp)
+            timeline: dict[str, Any] = await resp.json()
+            return timeline
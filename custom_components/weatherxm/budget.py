@@ -0,0 +1,170 @@
+"""Enforcement of a daily budget of WeatherXM API requests for each account.
+
+The requests remaining in the budget are spread over the rest of the (UTC) day.
+When the configured poll intervals would use more than that, forecasts and rewards
+are polled less frequently first, and observations only once forecasts and rewards
+are polled at the maximum interval. Requests stop once the budget is exhausted,
+until the daily count resets.
+"""
+
+import datetime
+import logging
+import math
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import event
+from homeassistant.util.hass_dict import HassKey
+
+from .account import WxmAccount
+from .const import CONF_DAILY_BUDGET, DOMAIN, MAX_INTERVAL
+from .entities import WxmCoordinators, daily_requests
+
+_LOGGER = logging.getLogger(__name__)
+
+_UPDATE_INTERVAL = datetime.timedelta(minutes=15)
+# Each station's client refreshes its access token about once per hour.
+_TOKEN_REFRESHES_PER_DAY = 24
+_MINUTES_PER_DAY = 24 * 60
+# Leave a minute of the day when projecting, to avoid dividing by zero at midnight.
+_MIN_DAY_REMAINING = 1 / _MINUTES_PER_DAY
+
+# Scales are rounded up to steps of about 19%.
+_SCALE_STEPS_PER_DOUBLING = 4
+
+_DATA_BUDGETS: HassKey[dict[str, "RequestBudget"]] = HassKey(f"{DOMAIN}_budgets")
+
+
+class RequestBudget:
+    """Stretches the poll intervals of an account's stations to stay in budget."""
+
+    def __init__(self, hass: HomeAssistant, account: WxmAccount) -> None:
+        self._hass = hass
+        self._account = account
+        self._entries: dict[str, ConfigEntry[WxmCoordinators]] = {}
+        self._unsub_update: CALLBACK_TYPE | None = None
+        self.device_scale = 1.0
+        """Multiplier applied to the observation poll intervals."""
+        self.slow_scale = 1.0
+        """Multiplier applied to the rewards and forecast poll intervals."""
+
+    @callback
+    def async_add_entry(self, entry: ConfigEntry[WxmCoordinators]) -> CALLBACK_TYPE:
+        """Include a weather station in the budget, returning a removal callback."""
+        self._entries[entry.entry_id] = entry
+        if self._unsub_update is None:
+            self._unsub_update = event.async_track_time_interval(
+                self._hass, self.async_update, _UPDATE_INTERVAL
+            )
+
+        @callback
+        def _async_remove() -> None:
+            self._entries.pop(entry.entry_id, None)
+            if not self._entries and self._unsub_update is not None:
+                self._unsub_update()
+                self._unsub_update = None
+            self.async_update()
+
+        return _async_remove
+
+    @callback
+    def async_update(self, _: datetime.datetime | None = None) -> None:
+        """Recalculate the poll interval scales and apply them to all stations."""
+        budgets = [
+            entry.options[CONF_DAILY_BUDGET]
+            for entry in self._entries.values()
+            if entry.options.get(CONF_DAILY_BUDGET)
+        ]
+        # Stations sharing an account may have different budgets configured.
+        self._account.usage.budget = int(min(budgets)) if budgets else None
+
+        device_scale, slow_scale = map(_quantise, self._scales())
+        if (device_scale, slow_scale) != (self.device_scale, self.slow_scale):
+            _LOGGER.debug(
+                "Scaling %s poll intervals by %.2f (observations) and %.2f (others)",
+                self._account.account_id,
+                device_scale,
+                slow_scale,
+            )
+        self.device_scale = device_scale
+        self.slow_scale = slow_scale
+
+        for entry in self._entries.values():
+            coordinators = entry.runtime_data
+            coordinators.device.interval_scale = device_scale
+            coordinators.rewards.interval_scale = slow_scale
+            coordinators.forecast.interval_scale = slow_scale
+            for coordinator in (
+                coordinators.device,
+                coordinators.rewards,
+                coordinators.forecast,
+            ):
+                coordinator.async_apply_interval()
+
+    def _scales(self) -> tuple[float, float]:
+        """Return the interval scales for observations, and rewards and forecasts."""
+        usage = self._account.usage
+        if usage.budget is None:
+            return 1.0, 1.0
+
+        # The requests per day which can be made for the rest of the day.
+        day_remaining = max(usage.day_remaining, _MIN_DAY_REMAINING)
+        allowance = (usage.budget - usage.requests_today) / day_remaining
+        allowance -= _TOKEN_REFRESHES_PER_DAY * len(self._entries)
+
+        device: list[datetime.timedelta] = []
+        slow: list[datetime.timedelta] = []
+        for entry in self._entries.values():
+            coordinators = entry.runtime_data
+            device.append(coordinators.device.configured_interval)
+            slow.append(coordinators.rewards.configured_interval)
+            # Forecasts are only polled while subscribed. Otherwise they may be
+            # fetched on demand, at most once per maximum age, which is stretched by
+            # the same scale.
+            forecast = coordinators.forecast
+            if forecast.polling:
+                slow.append(forecast.configured_interval)
+            elif forecast.fetching_on_demand:
+                slow.append(forecast.configured_max_age)
+
+        device_requests = daily_requests(device)
+        slow_requests = daily_requests(slow)
+        if device_requests + slow_requests <= allowance:
+            return 1.0, 1.0
+
+        slow_min_requests = len(slow) * _MINUTES_PER_DAY / MAX_INTERVAL
+        if device_requests + slow_min_requests <= allowance:
+            return 1.0, slow_requests / (allowance - device_requests)
+
+        # Even the maximum interval is exceeded once the allowance is used up,
+        # after which requests stop until the daily count resets.
+        max_scale = float(MAX_INTERVAL)
+        if allowance <= slow_min_requests:
+            return max_scale, max_scale
+        return (
+            min(device_requests / (allowance - slow_min_requests), max_scale),
+            max_scale,
+        )
+
+
+def _quantise(scale: float) -> float:
+    """Round a scale up to the next of a fixed set of steps.
+
+    Changing a poll interval reschedules the next poll, so the scales only change
+    when usage has moved significantly rather than at every update.
+    """
+    if scale <= 1:
+        return 1.0
+    steps = math.ceil(math.log2(scale) * _SCALE_STEPS_PER_DOUBLING)
+    return min(2 ** (steps / _SCALE_STEPS_PER_DOUBLING), float(MAX_INTERVAL))
+
+
+@callback
+def async_get_budget(hass: HomeAssistant, account: WxmAccount) -> RequestBudget:
+    """Return the request budget for an account."""
+    if (budgets := hass.data.get(_DATA_BUDGETS)) is None:
+        budgets = hass.data[_DATA_BUDGETS] = {}
+    budget: RequestBudget | None = budgets.get(account.account_id)
+    if budget is None:
+        budget = budgets[account.account_id] = RequestBudget(hass, account)
+    return budget
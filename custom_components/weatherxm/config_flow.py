@@ -1,16 +1,43 @@
 """Config flow for the WeatherXM integration."""
 
+from collections.abc import Mapping
 from typing import Any
 
 import pywxm
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.helpers import aiohttp_client, selector
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import selector
 
-from .const import CONF_DEVICE_ID, CONF_MINOR_VERSION, CONF_VERSION, DOMAIN
+from .account import async_get_account_by_id
+from .const import (
+    CONF_DAILY_BUDGET,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_INTERVAL,
+    CONF_FORECAST_INTERVAL,
+    CONF_FORECAST_MAX_AGE,
+    CONF_MINOR_VERSION,
+    CONF_PUSH_URL,
+    CONF_REWARDS_INTERVAL,
+    CONF_VERSION,
+    DEFAULT_DEVICE_INTERVAL,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_FORECAST_MAX_AGE,
+    DEFAULT_REWARDS_INTERVAL,
+    DOMAIN,
+    MAX_INTERVAL,
+    MIN_DAILY_BUDGET,
+    MIN_DEVICE_INTERVAL,
+    MIN_FORECAST_INTERVAL,
+    MIN_FORECAST_MAX_AGE,
+    MIN_REWARDS_INTERVAL,
+)
+from .entities import daily_requests, minutes_option
+from .session import async_create_session
 
 _CONTEXT_WXM_CLIENT = "wxm_client"
+_CONTEXT_USERNAME = "username"
 
 _CREDENTIALS_SCHEMA = vol.Schema(
     {
@@ -19,6 +46,65 @@ _CREDENTIALS_SCHEMA = vol.Schema(
     }
 )
 
+_INTERVAL_DEFAULTS = {
+    CONF_DEVICE_INTERVAL: DEFAULT_DEVICE_INTERVAL,
+    CONF_REWARDS_INTERVAL: DEFAULT_REWARDS_INTERVAL,
+    CONF_FORECAST_INTERVAL: DEFAULT_FORECAST_INTERVAL,
+}
+
+
+def _interval_selector(minimum: int) -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=MAX_INTERVAL,
+            step=1,
+            unit_of_measurement="min",
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
+
+
+_OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_DEVICE_INTERVAL, default=DEFAULT_DEVICE_INTERVAL
+        ): _interval_selector(MIN_DEVICE_INTERVAL),
+        vol.Required(
+            CONF_REWARDS_INTERVAL, default=DEFAULT_REWARDS_INTERVAL
+        ): _interval_selector(MIN_REWARDS_INTERVAL),
+        vol.Required(
+            CONF_FORECAST_INTERVAL, default=DEFAULT_FORECAST_INTERVAL
+        ): _interval_selector(MIN_FORECAST_INTERVAL),
+        vol.Required(
+            CONF_FORECAST_MAX_AGE, default=DEFAULT_FORECAST_MAX_AGE
+        ): _interval_selector(MIN_FORECAST_MAX_AGE),
+        vol.Optional(CONF_DAILY_BUDGET): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=MIN_DAILY_BUDGET,
+                max=1_000_000,
+                step=1,
+                unit_of_measurement="requests",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(CONF_PUSH_URL): selector.TextSelector(
+            selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+        ),
+    }
+)
+
+
+def _daily_requests(options: Mapping[str, Any]) -> float:
+    """Return the number of API requests per day made by a single station.
+
+    This is an upper bound, since forecasts are only polled while subscribed.
+    """
+    return daily_requests(
+        minutes_option(options, option, default)
+        for option, default in _INTERVAL_DEFAULTS.items()
+    )
+
 
 class WxmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Configures the WeatherXM integration."""
@@ -26,6 +112,14 @@ class WxmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = CONF_VERSION
     MINOR_VERSION = CONF_MINOR_VERSION
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        _: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Create the options flow."""
+        return WxmOptionsFlow()
+
     async def async_step_reauth(
         self, _: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -48,19 +142,27 @@ class WxmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initiated by the user."""
         errors: dict[str, str] = {}
         if data is not None:
-            wxm_client = pywxm.WxmClient(
-                aiohttp_client.async_get_clientsession(self.hass)
-            )
+            # Usernames are recorded to identify entries using the same account.
+            username = data[CONF_USERNAME].strip().lower()
             try:
-                refresh_token = await wxm_client.login(
-                    username=data[CONF_USERNAME],
-                    password=data[CONF_PASSWORD],
-                )
+                # Log in with a temporary session, so the shared account state is
+                # only created for valid credentials.
+                async with async_create_session(self.hass) as session:
+                    refresh_token = await pywxm.WxmClient(session).login(
+                        username=data[CONF_USERNAME],
+                        password=data[CONF_PASSWORD],
+                    )
+                account = async_get_account_by_id(self.hass, username)
+                wxm_client = pywxm.WxmClient(account.session, refresh_token)
                 self.context[_CONTEXT_WXM_CLIENT] = wxm_client  # type: ignore[literal-required]
+                self.context[_CONTEXT_USERNAME] = username  # type: ignore[literal-required]
                 if self.source == config_entries.SOURCE_REAUTH:
                     return self.async_update_reload_and_abort(
                         self._get_reauth_entry(),
-                        data_updates={CONF_ACCESS_TOKEN: refresh_token},
+                        data_updates={
+                            CONF_ACCESS_TOKEN: refresh_token,
+                            CONF_USERNAME: username,
+                        },
                     )
                 return await self.async_step_select_device()
             except pywxm.AuthenticationError as e:
@@ -106,9 +208,13 @@ class WxmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def _async_create_entry_for_device(
         self, wxm_api: pywxm.WxmApi, device_id: str
     ) -> config_entries.ConfigFlowResult:
+        username: str = self.context[_CONTEXT_USERNAME]  # type: ignore[literal-required]
         await self.async_set_unique_id(device_id)
         self._abort_if_unique_id_configured(
-            updates={CONF_ACCESS_TOKEN: wxm_api.client.refresh_token}
+            updates={
+                CONF_ACCESS_TOKEN: wxm_api.client.refresh_token,
+                CONF_USERNAME: username,
+            }
         )
 
         device_info = await wxm_api.get_device(device_id)
@@ -117,5 +223,81 @@ class WxmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data={
                 CONF_ACCESS_TOKEN: wxm_api.client.refresh_token,
                 CONF_DEVICE_ID: device_id,
+                CONF_USERNAME: username,
+            },
+        )
+
+
+class WxmOptionsFlow(config_entries.OptionsFlow):
+    """Configures the options for a WeatherXM weather station."""
+
+    def __init__(self) -> None:
+        self._options: dict[str, Any] = {}
+
+    async def async_step_init(
+        self, data: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the weather station options."""
+        errors: dict[str, str] = {}
+        if data is not None:
+            push_url = data.get(CONF_PUSH_URL)
+            if push_url and not push_url.startswith(("ws://", "wss://")):
+                errors[CONF_PUSH_URL] = "invalid_push_url"
+            else:
+                self._options = data
+                # Only ask for confirmation when the request volume changes.
+                if _daily_requests(data) == _daily_requests(self.config_entry.options):
+                    return self.async_create_entry(data=data)
+                return await self.async_step_confirm()
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                _OPTIONS_SCHEMA, data or self.config_entry.options
+            ),
+            errors=errors,
+            description_placeholders={
+                "daily_requests": _format_requests(_estimate_daily_requests(self.hass)),
             },
         )
+
+    async def async_step_confirm(
+        self, data: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Confirm the estimated API usage of the new poll intervals."""
+        if data is not None:
+            return self.async_create_entry(data=self._options)
+
+        return self.async_show_form(
+            step_id="confirm",
+            description_placeholders={
+                "daily_requests": _format_requests(
+                    _estimate_daily_requests(
+                        self.hass, {self.config_entry.entry_id: self._options}
+                    )
+                ),
+                "current_daily_requests": _format_requests(
+                    _estimate_daily_requests(self.hass)
+                ),
+            },
+        )
+
+
+def _estimate_daily_requests(
+    hass: HomeAssistant, overrides: Mapping[str, Mapping[str, Any]] | None = None
+) -> float:
+    """Estimate the total API requests per day made for all weather stations.
+
+    Args:
+        hass: The Home Assistant instance.
+        overrides: Options to use in place of the saved options, by config entry ID.
+    """
+    overrides = overrides or {}
+    return sum(
+        _daily_requests(overrides.get(entry.entry_id, entry.options))
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+
+
+def _format_requests(requests: float) -> str:
+    return f"{round(requests):,}"
@@ -6,3 +6,30 @@ CONF_VERSION = 1
 CONF_MINOR_VERSION = 1
 
 CONF_DEVICE_ID = "device_id"
+CONF_PUSH_URL = "push_url"
+
+ATTR_STALE_SINCE = "stale_since"
+
+# Poll intervals, in minutes.
+CONF_DEVICE_INTERVAL = "device_interval"
+CONF_REWARDS_INTERVAL = "rewards_interval"
+CONF_FORECAST_INTERVAL = "forecast_interval"
+DEFAULT_DEVICE_INTERVAL = 5
+DEFAULT_REWARDS_INTERVAL = 15
+DEFAULT_FORECAST_INTERVAL = 15
+# Stations report every 5 minutes, so polling more often can't return any more
+# observations.
+MIN_DEVICE_INTERVAL = 5
+MIN_REWARDS_INTERVAL = 5
+MIN_FORECAST_INTERVAL = 5
+MAX_INTERVAL = 24 * 60
+
+# Forecasts are only polled while subscribed, otherwise they are fetched on demand
+# once older than the maximum age, in minutes.
+CONF_FORECAST_MAX_AGE = "forecast_max_age"
+DEFAULT_FORECAST_MAX_AGE = 60
+MIN_FORECAST_MAX_AGE = 5
+
+# Poll intervals are stretched to keep each account's requests within the budget.
+CONF_DAILY_BUDGET = "daily_request_budget"
+MIN_DAILY_BUDGET = 100
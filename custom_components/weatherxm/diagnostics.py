@@ -0,0 +1,53 @@
+"""Diagnostics support for the WeatherXM integration."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .entities import WxmApiCoordinator, WxmCoordinators
+
+_TO_REDACT = {CONF_ACCESS_TOKEN, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: ConfigEntry[WxmCoordinators],
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators = entry.runtime_data
+    forecast_stats = coordinators.forecast.update_stats
+    api_usage = coordinators.device.account.usage
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, _TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "circuit_breaker": coordinators.device.account.breaker.state,
+        "api_usage": {
+            "daily_budget": api_usage.budget,
+            "today": dict(api_usage.today),
+            "station_today": dict(
+                api_usage.device_today(coordinators.device.device_id)
+            ),
+            "total": dict(api_usage.total),
+        },
+        "device": _coordinator_diagnostics(coordinators.device),
+        "rewards": _coordinator_diagnostics(coordinators.rewards),
+        "forecast": {
+            **_coordinator_diagnostics(coordinators.forecast),
+            "last_update": (forecast_stats._asdict() if forecast_stats else None),
+        },
+    }
+
+
+def _coordinator_diagnostics(coordinator: WxmApiCoordinator[Any]) -> dict[str, Any]:
+    return {
+        "update_interval": coordinator.update_interval,
+        "interval_scale": coordinator.interval_scale,
+        "last_update_success": coordinator.last_update_success,
+        "last_fetch_time": coordinator.last_fetch_time,
+        "stale": coordinator.stale,
+    }
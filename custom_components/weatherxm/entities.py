@@ -1,147 +1,412 @@
 """Utility classes for interacting with the WeatherXM API."""
 
+import asyncio
 import datetime
 import logging
-from dataclasses import dataclass
-from typing import cast
+import time
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar, cast
 
 import pywxm
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry, update_coordinator
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry, storage, update_coordinator
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .account import WxmAccount, WxmRequestError
+from .aggregates import ObservationAggregates
+from .api import WxmApi
+from .const import (
+    ATTR_STALE_SINCE,
+    CONF_DEVICE_INTERVAL,
+    CONF_FORECAST_INTERVAL,
+    CONF_FORECAST_MAX_AGE,
+    CONF_REWARDS_INTERVAL,
+    DEFAULT_DEVICE_INTERVAL,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_FORECAST_MAX_AGE,
+    DEFAULT_REWARDS_INTERVAL,
+    DOMAIN,
+    MAX_INTERVAL,
+)
+from .transport import DeviceTransport
+
+if TYPE_CHECKING:
+    # The forecast module is only needed once forecasts are fetched, by which time
+    # the weather platform has imported it, so it isn't imported with the package.
+    from .forecast import CompactForecast, ForecastUpdateStats, ForecastViews
 
 _LOGGER = logging.getLogger(__name__)
 
+_AGGREGATES_STORAGE_VERSION = 1
+# Avoid writing to disk for every observation, the aggregates are also saved when
+# Home Assistant shuts down.
+_AGGREGATES_SAVE_DELAY = 15 * 60
 
-class WxmCoordinator(update_coordinator.DataUpdateCoordinator[pywxm.WxmDevice]):
-    """Co-ordinator to poll the WeatherXM API for device updates."""
+# A full 8 day forecast with hourly data is several tens of KiB and takes
+# milliseconds to parse and convert. Smaller responses are cheaper to parse on the
+# event loop than to hand off to an executor.
+_EXECUTOR_PAYLOAD_BYTES = 32 * 1024
 
-    def __init__(
+# Forecasts requested within a couple of maximum ages are still being fetched on
+# demand, allowing for requests which don't arrive exactly as forecasts age.
+_ON_DEMAND_PERIODS = 2
+
+_DataT = TypeVar("_DataT")
+
+
+class WxmApiCoordinator(update_coordinator.TimestampDataUpdateCoordinator[_DataT]):
+    """Base co-ordinator for polling the WeatherXM API.
+
+    Requests are guarded by the account's circuit breaker. While the WeatherXM API
+    is failing the last successfully fetched data continues to be provided and is
+    marked as stale, rather than making all entities unavailable.
+    """
+
+    config_entry: ConfigEntry["WxmCoordinators"]
+
+    def __init__(  # noqa: PLR0913
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry["WxmCoordinators"],
-        wxm_api: pywxm.WxmApi,
+        wxm_api: WxmApi,
+        account: WxmAccount,
         device_id: str,
+        *,
+        name: str,
+        interval_option: str,
+        default_interval: int,
     ) -> None:
-        """Initialise the co-ordinator."""
+        """Initialise the co-ordinator.
+
+        Args:
+            interval_option: The config entry option holding the poll interval.
+            default_interval: The poll interval in minutes if the option is not set.
+        """
         super().__init__(
             hass=hass,
             config_entry=config_entry,
             logger=_LOGGER,
-            name=f"WeatherXM {device_id}",
-            update_interval=datetime.timedelta(minutes=5),
+            name=name,
+            update_interval=minutes_option(
+                config_entry.options, interval_option, default_interval
+            ),
             always_update=False,
         )
+        self._interval_option = interval_option
+        self._default_interval = default_interval
+        self.interval_scale = 1.0
+        """Multiplier applied to the configured poll interval to stay in budget."""
         self.wxm_api = wxm_api
+        self.account = account
         self.device_id = device_id
+        self.last_fetch_time: datetime.datetime | None = None
+        """When data was last successfully fetched from the API, or pushed."""
+        self.stale = False
+        """Whether the data is stale because the API is unavailable."""
 
-    async def _async_update_data(self) -> pywxm.WxmDevice:
-        """Fetch updated weather data."""
+    @property
+    def configured_interval(self) -> datetime.timedelta:
+        """The poll interval configured in the config entry options."""
+        return minutes_option(
+            self.config_entry.options, self._interval_option, self._default_interval
+        )
+
+    @property
+    def polling(self) -> bool:
+        """Whether the co-ordinator is polling, which requires listeners."""
+        return bool(self._listeners)
+
+    @callback
+    def async_apply_interval(self) -> None:
+        """Apply the poll interval from the config entry options.
+
+        The configured interval is stretched by the interval scale, up to the
+        maximum poll interval.
+        """
+        interval = self._scaled(self.configured_interval)
+        if interval == self.update_interval:
+            return
+        _LOGGER.debug("Changing %s poll interval to %s", self.name, interval)
+        # The stubs lose the update_interval setter.
+        self.update_interval = interval  # type: ignore[misc]
+        # Reschedule any pending refresh so the new interval applies immediately.
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _scaled(self, interval: datetime.timedelta) -> datetime.timedelta:
+        """Stretch an interval by the interval scale, up to the maximum interval."""
+        return max(
+            interval,
+            min(
+                interval * self.interval_scale, datetime.timedelta(minutes=MAX_INTERVAL)
+            ),
+        )
+
+    async def _async_update_data(self) -> _DataT:
+        """Fetch updated data, or return stale data if the API is unavailable."""
         try:
-            device_info = await self.wxm_api.get_device(self.device_id)
+            async with self.account.async_request():
+                data = await self._async_fetch()
         except pywxm.AuthenticationError as e:
             raise update_coordinator.ConfigEntryAuthFailed from e
-        except pywxm.UnexpectedError as e:
-            raise update_coordinator.UpdateFailed(
-                f"Error communicating with WeatherXM: {e.message}"
-            ) from e
-        else:
-            _LOGGER.debug("Updated device info: %s", device_info)
-            return device_info
+        except WxmRequestError as e:
+            return self._stale_data(str(e))
+
+        self.last_fetch_time = dt_util.utcnow()
+        if self.stale:
+            self.stale = False
+            self.async_update_listeners()
+        return data
+
+    async def _async_fetch(self) -> _DataT:
+        """Fetch updated data from the WeatherXM API."""
+        raise NotImplementedError
+
+    def _stale_data(self, reason: str) -> _DataT:
+        if self.data is None:
+            raise update_coordinator.UpdateFailed(reason)
+        if not self.stale:
+            _LOGGER.warning("%s, using data from %s", reason, self.last_fetch_time)
+            self.stale = True
+            # Listeners aren't notified if the data is unchanged, but entities need
+            # to report that their data is stale.
+            self.async_update_listeners()
+        return cast(_DataT, self.data)
+
+
+class WxmCoordinator(WxmApiCoordinator[pywxm.WxmDevice]):
+    """Co-ordinator to poll the WeatherXM API for device updates."""
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry["WxmCoordinators"],
+        wxm_api: WxmApi,
+        account: WxmAccount,
+        device_id: str,
+    ) -> None:
+        """Initialise the co-ordinator."""
+        super().__init__(
+            hass=hass,
+            config_entry=config_entry,
+            wxm_api=wxm_api,
+            account=account,
+            device_id=device_id,
+            name=f"WeatherXM {device_id}",
+            interval_option=CONF_DEVICE_INTERVAL,
+            default_interval=DEFAULT_DEVICE_INTERVAL,
+        )
+        self.aggregates = ObservationAggregates()
+        self._aggregates_store = aggregates_store(hass, config_entry)
+        self.transport: DeviceTransport | None = None
+
+    async def _async_setup(self) -> None:
+        """Restore the rolling aggregates saved before the last restart."""
+        if (data := await self._aggregates_store.async_load()) is not None:
+            self.aggregates = ObservationAggregates.from_dict(data)
+
+    async def _async_update_data(self) -> pywxm.WxmDevice:
+        """Fetch updated weather data, and age out old samples from the aggregates."""
+        data = await super()._async_update_data()
+        evicted = self.aggregates.evict(dt_util.utcnow().timestamp())
+        if evicted and data == self.data:
+            # Listeners aren't notified if the data is unchanged, but the aggregate
+            # entities need to report the aggregates without the evicted samples.
+            self.async_update_listeners()
+        return data
+
+    async def _async_fetch(self) -> pywxm.WxmDevice:
+        """Fetch updated weather data."""
+        device_info = await self.wxm_api.get_device(self.device_id)
+        _LOGGER.debug("Updated device info: %s", device_info)
+        self._record_observation(device_info)
+        return device_info
+
+    async def async_set_transport(self, transport: DeviceTransport | None) -> None:
+        """Set the transport used to receive pushed device updates.
+
+        Polling continues as a fallback, but each pushed update resets the poll
+        interval, so the API is only polled if pushed updates stop arriving.
+        """
+        if self.transport:
+            await self.transport.async_stop()
+        self.transport = transport
+        if transport:
+            transport.async_start(self._async_handle_pushed_device)
+
+    @callback
+    def _async_handle_pushed_device(self, device: pywxm.WxmDevice) -> None:
+        _LOGGER.debug("Received pushed device info: %s", device)
+        self._record_observation(device)
+        # Pushed data is as fresh as polled data, so is no longer stale.
+        self.last_fetch_time = dt_util.utcnow()
+        was_stale = self.stale
+        self.stale = False
+        if device != self.data:
+            self.async_set_updated_data(device)
+        elif was_stale:
+            self.async_update_listeners()
+
+    def _record_observation(self, device: pywxm.WxmDevice) -> None:
+        """Add the latest observation to the rolling aggregates."""
+        if self.aggregates.add(device.current_weather):
+            self._aggregates_store.async_delay_save(
+                self.aggregates.as_dict, _AGGREGATES_SAVE_DELAY
+            )
 
-class WxmRewardsCoordinator(
-    update_coordinator.DataUpdateCoordinator[pywxm.DeviceRewards]
-):
+
+class WxmRewardsCoordinator(WxmApiCoordinator[pywxm.DeviceRewards]):
     """Co-ordinator to poll the WeatherXM API for device rewards updates."""
 
     def __init__(
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry["WxmCoordinators"],
-        wxm_api: pywxm.WxmApi,
+        wxm_api: WxmApi,
+        account: WxmAccount,
         device_id: str,
     ) -> None:
         """Initialise the co-ordinator."""
         super().__init__(
             hass=hass,
             config_entry=config_entry,
-            logger=_LOGGER,
+            wxm_api=wxm_api,
+            account=account,
+            device_id=device_id,
             name=f"WeatherXM Rewards {device_id}",
             # Rewards data is typically updated once per day, so no need to poll too
             # frequently
-            update_interval=datetime.timedelta(minutes=15),
-            always_update=False,
+            interval_option=CONF_REWARDS_INTERVAL,
+            default_interval=DEFAULT_REWARDS_INTERVAL,
         )
-        self.wxm_api = wxm_api
-        self.device_id = device_id
 
-    async def _async_update_data(self) -> pywxm.DeviceRewards:
+    async def _async_fetch(self) -> pywxm.DeviceRewards:
         """Fetch updated rewards data."""
-        try:
-            device_rewards = await self.wxm_api.get_latest_rewards(self.device_id)
-        except pywxm.AuthenticationError as e:
-            raise update_coordinator.ConfigEntryAuthFailed from e
-        except pywxm.UnexpectedError as e:
-            raise update_coordinator.UpdateFailed(
-                f"Error communicating with WeatherXM: {e.message}"
-            ) from e
-        else:
-            _LOGGER.debug("Updated rewards info: %s", device_rewards)
-            return device_rewards
+        device_rewards = await self.wxm_api.get_latest_rewards(self.device_id)
+        _LOGGER.debug("Updated rewards info: %s", device_rewards)
+        return device_rewards
+
 
+class WxmForecastCoordinator(WxmApiCoordinator["CompactForecast"]):
+    """Co-ordinator to poll the WeatherXM API for forecast updates.
 
-class WxmForecastCoordinator(
-    update_coordinator.TimestampDataUpdateCoordinator[pywxm.WeatherForecast]
-):
-    """Co-ordinator to poll the WeatherXM API for forecast updates."""
+    Like all co-ordinators, forecasts are only polled while there are listeners,
+    which for forecasts means forecast subscribers. Forecasts requested while there
+    are no subscribers are fetched on demand by async_refresh_if_old.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry["WxmCoordinators"],
-        wxm_api: pywxm.WxmApi,
+        wxm_api: WxmApi,
+        account: WxmAccount,
         device_id: str,
     ) -> None:
         """Initialise the co-ordinator."""
         super().__init__(
             hass=hass,
             config_entry=config_entry,
-            logger=_LOGGER,
+            wxm_api=wxm_api,
+            account=account,
+            device_id=device_id,
             name=f"WeatherXM Forecast {device_id}",
-            update_interval=datetime.timedelta(minutes=15),
-            always_update=False,
+            interval_option=CONF_FORECAST_INTERVAL,
+            default_interval=DEFAULT_FORECAST_INTERVAL,
         )
-        self.wxm_api = wxm_api
-        self.device_id = device_id
+        self.views: ForecastViews | None = None
+        self.update_stats: ForecastUpdateStats | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._last_demand_time: datetime.datetime | None = None
+
+    async def async_refresh_if_old(self) -> None:
+        """Refresh the forecast if it is older than the maximum age."""
+        self._last_demand_time = dt_util.utcnow()
+        # Concurrent callers wait for a single refresh.
+        async with self._refresh_lock:
+            if self.is_old:
+                await self.async_refresh()
+
+    @property
+    def configured_max_age(self) -> datetime.timedelta:
+        """The maximum age of forecasts fetched on demand, from the options."""
+        return minutes_option(
+            self.config_entry.options, CONF_FORECAST_MAX_AGE, DEFAULT_FORECAST_MAX_AGE
+        )
+
+    @property
+    def max_age(self) -> datetime.timedelta:
+        """The maximum age of forecasts fetched on demand.
 
-    async def _async_update_data(self) -> pywxm.WeatherForecast:
+        Like the poll interval, the configured age is stretched by the interval
+        scale to stay within the request budget.
+        """
+        return self._scaled(self.configured_max_age)
+
+    @property
+    def fetching_on_demand(self) -> bool:
+        """Whether forecasts are being fetched on demand rather than polled.
+
+        Forecasts are fetched on demand while they are requested without a
+        subscriber, e.g. by nowcast sensors or automations.
+        """
+        return (
+            not self.polling
+            and self._last_demand_time is not None
+            and dt_util.utcnow() - self._last_demand_time
+            < self.max_age * _ON_DEMAND_PERIODS
+        )
+
+    @property
+    def is_old(self) -> bool:
+        """Whether the forecast is older than the maximum age."""
+        return (
+            self.last_fetch_time is None
+            or dt_util.utcnow() - self.last_fetch_time >= self.max_age
+        )
+
+    async def _async_fetch(self) -> "CompactForecast":
         """Fetch updated weather forecasts."""
-        try:
-            # Aim for up to 8 days of forecast if available
-            from_date = dt_util.now().date()
-            to_date = from_date + datetime.timedelta(days=7)
-            forecast = await self.wxm_api.get_forecast(
-                self.device_id,
-                from_date=from_date,
-                to_date=to_date,
+        from .forecast import ForecastUpdateStats, timed_parse_forecast
+
+        # Aim for up to 8 days of forecast if available
+        from_date = dt_util.now().date()
+        to_date = from_date + datetime.timedelta(days=7)
+        # Fetch the raw response so it can be parsed outside the event loop.
+        payload = await self.wxm_api.get_forecast_payload(
+            self.device_id, from_date, to_date
+        )
+
+        in_executor = len(payload) > _EXECUTOR_PAYLOAD_BYTES
+        result: tuple[CompactForecast, ForecastViews | None, float]
+        if in_executor:
+            # Only the hand-off to the executor runs on the event loop.
+            start = time.perf_counter()
+            parse_job = self.hass.async_add_executor_job(
+                timed_parse_forecast, payload, self.data
             )
-        except pywxm.AuthenticationError as e:
-            raise update_coordinator.ConfigEntryAuthFailed from e
-        except pywxm.UnexpectedError as e:
-            raise update_coordinator.UpdateFailed(
-                f"Error communicating with WeatherXM: {e.message}"
-            ) from e
+            loop_blocking_seconds = time.perf_counter() - start
+            result = await parse_job
         else:
-            _LOGGER.debug("Updated weather forecast: %s", forecast)
-            return forecast
+            start = time.perf_counter()
+            result = timed_parse_forecast(payload, self.data)
+            loop_blocking_seconds = time.perf_counter() - start
+        forecast, views, parse_seconds = result
+
+        self.update_stats = ForecastUpdateStats(
+            payload_bytes=len(payload),
+            in_executor=in_executor,
+            parse_seconds=parse_seconds,
+            loop_blocking_seconds=loop_blocking_seconds,
+        )
+        _LOGGER.debug("Forecast update for %s: %s", self.device_id, self.update_stats)
+        if views is not None:
+            self.views = views
+        return forecast
 
 
-@dataclass(frozen=True)
-class WxmCoordinators:
+class WxmCoordinators(NamedTuple):
     """Groups all coordinators so they can be stored in the ConfigEntry runtime data."""
 
     device: WxmCoordinator
@@ -163,6 +428,11 @@ class WxmEntity(update_coordinator.CoordinatorEntity[WxmCoordinator]):
         wxm_device: pywxm.WxmDevice = coordinator.data
         self._attr_device_info = device_info(wxm_device)
 
+    @property
+    def wxm_coordinator(self) -> WxmCoordinator:
+        # Typing for self.coordinator doesn't seem to survive the base class generics.
+        return cast(WxmCoordinator, self.coordinator)
+
     @property
     def wxm_device(self) -> pywxm.WxmDevice:
         # Typing for self.coordinator doesn't seem to survive the base class generics.
@@ -172,6 +442,10 @@ class WxmEntity(update_coordinator.CoordinatorEntity[WxmCoordinator]):
     def current_weather(self) -> pywxm.HourlyWeatherData:
         return self.wxm_device.current_weather
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:  # type: ignore[override]
+        return stale_attributes(self.coordinator)
+
 
 class WxmRewardsEntity(update_coordinator.CoordinatorEntity[WxmRewardsCoordinator]):
     """A mix-in class for common WeatherXM Rewards entity logic."""
@@ -196,6 +470,46 @@ class WxmRewardsEntity(update_coordinator.CoordinatorEntity[WxmRewardsCoordinato
         # Typing for self.coordinator doesn't seem to survive the base class generics.
         return cast(pywxm.DeviceRewards, self.coordinator.data)
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:  # type: ignore[override]
+        return stale_attributes(self.coordinator)
+
+
+def stale_attributes(
+    coordinator: WxmApiCoordinator[Any],
+) -> Mapping[str, Any] | None:
+    """Return the state attributes reporting whether an entity's data is stale."""
+    if not coordinator.stale:
+        return None
+    return {ATTR_STALE_SINCE: coordinator.last_fetch_time}
+
+
+def minutes_option(
+    options: Mapping[str, Any], option: str, default: int
+) -> datetime.timedelta:
+    """Return a duration in minutes configured in config entry options."""
+    return datetime.timedelta(minutes=options.get(option, default))
+
+
+def daily_requests(intervals: Iterable[datetime.timedelta]) -> float:
+    """Return the requests per day made by polling at each of the intervals.
+
+    Shared by the options flow's estimate and the request budget, so that they
+    agree.
+    """
+    return sum(datetime.timedelta(days=1) / interval for interval in intervals)
+
+
+def aggregates_store(
+    hass: HomeAssistant, config_entry: ConfigEntry[Any]
+) -> storage.Store[dict[str, Any]]:
+    """Return the store used to persist the rolling aggregates for a station."""
+    return storage.Store(
+        hass,
+        _AGGREGATES_STORAGE_VERSION,
+        f"{DOMAIN}.{config_entry.entry_id}.aggregates",
+    )
+
 
 def device_info(device: pywxm.WxmDevice) -> device_registry.DeviceInfo:
     """Return device info for a WeatherXM device."""
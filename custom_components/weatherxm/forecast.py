@@ -0,0 +1,489 @@
+"""Compact storage for WeatherXM weather forecasts.
+
+Forecasts are stored as columns of typed arrays rather than as a graph of objects
+per hour, which significantly reduces the memory held for each weather station.
+Icon and time zone strings are interned and referenced by index.
+"""
+
+import bisect
+import datetime
+import logging
+import math
+import sys
+import time
+from array import array
+from collections import Counter
+from typing import Literal, NamedTuple
+
+import pywxm
+from homeassistant.components import weather
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+ForecastType = Literal["daily", "hourly", "twice_daily"]
+
+_MAX_HOURLY_FORECASTS = 48
+
+# Twice daily forecasts split each date into a day part from 06:00 to 18:00 and a
+# night part from 18:00 to 06:00 the following morning (local time).
+_DAYTIME_START_HOUR = 6
+_DAYTIME_END_HOUR = 18
+
+
+class DayColumns(NamedTuple):
+    """Columns of data for each forecast date."""
+
+    timestamp: "array[float]"
+    """POSIX timestamp of local midnight at the start of the date."""
+    timezone: "array[int]"
+    """Index into the forecast time zones."""
+    has_daily_forecast: "array[int]"
+    """Whether daily forecast data is available for the date.
+
+    Daily forecast columns should be ignored if no daily forecast is available.
+    """
+    temperature_min: "array[float]"
+    temperature_max: "array[float]"
+    humidity: "array[int]"
+    pressure: "array[float]"
+    precipitation_probability: "array[int]"
+    precipitation_intensity: "array[float]"
+    wind_speed: "array[float]"
+    wind_direction: "array[int]"
+    uv_index: "array[int]"
+    icon: "array[int]"
+    """Index into the forecast icons."""
+
+
+class HourColumns(NamedTuple):
+    """Columns of data for each hourly forecast, in chronological order."""
+
+    timestamp: "array[float]"
+    """POSIX timestamp of the hour."""
+    day: "array[int]"
+    """Index of the forecast date containing the hour."""
+    temperature: "array[float]"
+    feels_like_temperature: "array[float]"
+    humidity: "array[int]"
+    pressure: "array[float]"
+    precipitation: "array[float]"
+    precipitation_probability: "array[int]"
+    wind_speed: "array[float]"
+    wind_direction: "array[int]"
+    uv_index: "array[int]"
+    icon: "array[int]"
+    """Index into the forecast icons."""
+
+
+class CompactForecast(NamedTuple):
+    """A WeatherXM weather forecast stored in a compact column layout."""
+
+    icons: tuple[str, ...]
+    timezones: tuple[str, ...]
+    days: DayColumns
+    hours: HourColumns
+
+    @classmethod
+    def from_wxm(cls, forecast: pywxm.WeatherForecast) -> "CompactForecast":
+        """Convert a parsed WeatherXM forecast into the compact layout."""
+        icons: dict[str, int] = {}
+        timezones: dict[str, int] = {}
+
+        def intern(table: dict[str, int], value: str) -> int:
+            return table.setdefault(sys.intern(value), len(table))
+
+        days = DayColumns(
+            timestamp=array("d"),
+            timezone=array("H"),
+            has_daily_forecast=array("b"),
+            temperature_min=array("d"),
+            temperature_max=array("d"),
+            humidity=array("h"),
+            pressure=array("d"),
+            precipitation_probability=array("h"),
+            precipitation_intensity=array("d"),
+            wind_speed=array("d"),
+            wind_direction=array("h"),
+            uv_index=array("h"),
+            icon=array("H"),
+        )
+        hours = HourColumns(
+            timestamp=array("d"),
+            day=array("H"),
+            temperature=array("d"),
+            feels_like_temperature=array("d"),
+            humidity=array("h"),
+            pressure=array("d"),
+            precipitation=array("d"),
+            precipitation_probability=array("h"),
+            wind_speed=array("d"),
+            wind_direction=array("h"),
+            uv_index=array("h"),
+            icon=array("H"),
+        )
+
+        # Values stored in integer columns are rounded, as appending a fractional
+        # value from the API would raise an error and lose the whole forecast.
+        for day, f in enumerate(forecast.forecast):
+            days.timestamp.append(_local_midnight(f.forecast_date, f.timezone))
+            days.timezone.append(intern(timezones, f.timezone))
+            daily = f.daily_forecast
+            days.has_daily_forecast.append(daily is not None)
+            days.temperature_min.append(daily.temperature_min if daily else 0)
+            days.temperature_max.append(daily.temperature_max if daily else 0)
+            days.humidity.append(round(daily.humidity) if daily else 0)
+            days.pressure.append(daily.pressure if daily else 0)
+            days.precipitation_probability.append(
+                round(daily.precipitation_probability) if daily else 0
+            )
+            days.precipitation_intensity.append(
+                daily.precipitation_intensity if daily else 0
+            )
+            days.wind_speed.append(daily.wind_speed if daily else 0)
+            days.wind_direction.append(round(daily.wind_direction) if daily else 0)
+            days.uv_index.append(round(daily.uv_index) if daily else 0)
+            days.icon.append(intern(icons, daily.icon) if daily else 0)
+
+            for h in f.hourly_forecasts or []:
+                hours.timestamp.append(h.timestamp.timestamp())
+                hours.day.append(day)
+                hours.temperature.append(h.temperature)
+                hours.feels_like_temperature.append(h.feels_like_temperature)
+                hours.humidity.append(round(h.humidity))
+                hours.pressure.append(h.pressure)
+                hours.precipitation.append(h.precipitation)
+                hours.precipitation_probability.append(
+                    round(h.precipitation_probability)
+                )
+                hours.wind_speed.append(h.wind_speed)
+                hours.wind_direction.append(round(h.wind_direction))
+                hours.uv_index.append(round(h.uv_index))
+                hours.icon.append(intern(icons, h.icon))
+
+        return cls(
+            icons=tuple(icons),
+            timezones=tuple(timezones),
+            days=days,
+            hours=hours,
+        )
+
+
+class ForecastViews(NamedTuple):
+    """Indexes of a compact forecast for each type of Home Assistant forecast.
+
+    Forecasts are only converted into the Home Assistant format for the entries
+    selected when they are requested, so the views add little to the memory held
+    for the compact forecast.
+    """
+
+    forecast: CompactForecast
+    daily_days: "array[int]"
+    """Index of each date with a daily forecast."""
+    twice_daily_starts: "array[int]"
+    """Index of the first hour of each twice daily forecast."""
+    twice_daily_timestamps: "array[float]"
+    """POSIX timestamp of the start of each twice daily forecast."""
+    twice_daily_is_daytime: "array[int]"
+
+    def select(self, forecast_type: ForecastType, now: float) -> list[weather.Forecast]:
+        """Select and convert the forecasts to provide at a POSIX timestamp."""
+        forecast = self.forecast
+        start, end = self._window(forecast_type, now)
+        match forecast_type:
+            case "hourly":
+                return [_hourly_wxm_to_ha(forecast, i) for i in range(start, end)]
+            case "daily":
+                return [
+                    _daily_wxm_to_ha(forecast, self.daily_days[i])
+                    for i in range(start, end)
+                ]
+            case "twice_daily":
+                return [self._twice_daily_to_ha(i) for i in range(start, end)]
+
+    def fingerprint(self, forecast_type: ForecastType, now: float) -> int:
+        """Return a fingerprint of the forecasts selected at a POSIX timestamp.
+
+        The fingerprint is calculated from the compact forecast without converting
+        it, and can be used to detect whether the forecasts have changed.
+        """
+        start, end = self._window(forecast_type, now)
+        match forecast_type:
+            case "hourly":
+                content = _column_bytes(self.forecast.hours, start, end)
+            case "daily":
+                content = _column_bytes(
+                    self.forecast.days, 0, len(self.forecast.days.timestamp)
+                )
+            case "twice_daily":
+                # The selected periods run until the end of the hourly forecasts.
+                first_hour = self.twice_daily_starts[start] if start < end else 0
+                content = (
+                    self.twice_daily_is_daytime[start:end].tobytes(),
+                    *_column_bytes(
+                        self.forecast.hours,
+                        first_hour,
+                        len(self.forecast.hours.timestamp),
+                    ),
+                )
+        return hash((forecast_type, self.forecast.icons, content))
+
+    def _window(self, forecast_type: ForecastType, now: float) -> tuple[int, int]:
+        """Return the range of forecast indices to provide at a POSIX timestamp."""
+        match forecast_type:
+            case "hourly":
+                # Forecasts from now for up to 48 hours
+                hours = self.forecast.hours
+                start = bisect.bisect_right(hours.timestamp, now)
+                return start, min(start + _MAX_HOURLY_FORECASTS, len(hours.timestamp))
+            case "daily":
+                return 0, len(self.daily_days)
+            case "twice_daily":
+                # Forecasts from the current part of the day onwards
+                start = bisect.bisect_right(self.twice_daily_timestamps, now) - 1
+                return max(start, 0), len(self.twice_daily_starts)
+
+    def _twice_daily_end(self, period: int) -> int:
+        """Return the index after the last hour of a twice daily forecast."""
+        if period + 1 < len(self.twice_daily_starts):
+            return self.twice_daily_starts[period + 1]
+        return len(self.forecast.hours.timestamp)
+
+    def _twice_daily_to_ha(self, period: int) -> weather.Forecast:
+        aggregate = _TwiceDailyPeriod(
+            is_daytime=bool(self.twice_daily_is_daytime[period]),
+            timestamp=self.twice_daily_timestamps[period],
+        )
+        for hour in range(
+            self.twice_daily_starts[period], self._twice_daily_end(period)
+        ):
+            aggregate.add(self.forecast, hour)
+        return aggregate.to_ha(self.forecast)
+
+    @classmethod
+    def from_compact(cls, forecast: CompactForecast) -> "ForecastViews":
+        """Index the forecast views with a single pass over the forecast."""
+        days = forecast.days
+        hours = forecast.hours
+        daily_days = array("H")
+        twice_daily_starts = array("H")
+        twice_daily_timestamps = array("d")
+        twice_daily_is_daytime = array("b")
+
+        period: tuple[datetime.date, bool] | None = None
+        hour = 0
+        for day in range(len(days.timestamp)):
+            if days.has_daily_forecast[day]:
+                daily_days.append(day)
+
+            timezone = dt_util.get_time_zone(forecast.timezones[days.timezone[day]])
+            while hour < len(hours.timestamp) and hours.day[hour] == day:
+                # Night periods belong to the date on which they start.
+                local_time = datetime.datetime.fromtimestamp(
+                    hours.timestamp[hour], timezone
+                )
+                is_daytime = _DAYTIME_START_HOUR <= local_time.hour < _DAYTIME_END_HOUR
+                period_date = local_time.date()
+                if local_time.hour < _DAYTIME_START_HOUR:
+                    period_date -= datetime.timedelta(days=1)
+
+                if period != (period_date, is_daytime):
+                    period = (period_date, is_daytime)
+                    twice_daily_starts.append(hour)
+                    twice_daily_timestamps.append(hours.timestamp[hour])
+                    twice_daily_is_daytime.append(is_daytime)
+                hour += 1
+
+        return cls(
+            forecast=forecast,
+            daily_days=daily_days,
+            twice_daily_starts=twice_daily_starts,
+            twice_daily_timestamps=twice_daily_timestamps,
+            twice_daily_is_daytime=twice_daily_is_daytime,
+        )
+
+
+class ForecastUpdateStats(NamedTuple):
+    """Measurements from the most recent forecast update."""
+
+    payload_bytes: int
+    """Size of the forecast response."""
+    in_executor: bool
+    """Whether the forecast was parsed in an executor."""
+    parse_seconds: float
+    """Time taken to parse and convert the forecast."""
+    loop_blocking_seconds: float
+    """Time the event loop was blocked parsing the forecast, or handing it off."""
+
+
+class _TwiceDailyPeriod:
+    """Aggregates the hourly forecasts for one part of a day."""
+
+    def __init__(self, *, is_daytime: bool, timestamp: float) -> None:
+        self.is_daytime = is_daytime
+        self.timestamp = timestamp
+
+        self._count = 0
+        self._temperature_max = -math.inf
+        self._temperature_min = math.inf
+        self._humidity_total = 0
+        self._pressure_total = 0.0
+        self._precipitation_total = 0.0
+        self._precipitation_probability_max = 0
+        self._wind_speed_total = 0.0
+        # Wind bearings are averaged as vectors so that e.g. 350 and 10 degrees
+        # average to 0 degrees rather than 180.
+        self._wind_x_total = 0.0
+        self._wind_y_total = 0.0
+        self._uv_index_max = 0
+        self._icons: Counter[int] = Counter()
+
+    def add(self, forecast: CompactForecast, hour: int) -> None:
+        """Add an hourly forecast to the period."""
+        hours = forecast.hours
+        temperature = hours.temperature[hour]
+        wind_direction = math.radians(hours.wind_direction[hour])
+
+        self._count += 1
+        self._temperature_max = max(self._temperature_max, temperature)
+        self._temperature_min = min(self._temperature_min, temperature)
+        self._humidity_total += hours.humidity[hour]
+        self._pressure_total += hours.pressure[hour]
+        self._precipitation_total += hours.precipitation[hour]
+        self._precipitation_probability_max = max(
+            self._precipitation_probability_max,
+            hours.precipitation_probability[hour],
+        )
+        self._wind_speed_total += hours.wind_speed[hour]
+        self._wind_x_total += math.sin(wind_direction)
+        self._wind_y_total += math.cos(wind_direction)
+        self._uv_index_max = max(self._uv_index_max, hours.uv_index[hour])
+        self._icons[hours.icon[hour]] += 1
+
+    def to_ha(self, forecast: CompactForecast) -> weather.Forecast:
+        """Convert the period into a Home Assistant twice daily forecast."""
+        icon = self._icons.most_common(1)[0][0]
+        wind_bearing = math.degrees(math.atan2(self._wind_x_total, self._wind_y_total))
+        return weather.Forecast(
+            datetime=dt_util.utc_from_timestamp(self.timestamp).isoformat(),
+            is_daytime=self.is_daytime,
+            condition=condition_wxm_to_ha(forecast.icons[icon]),
+            humidity=round(self._humidity_total / self._count),
+            native_precipitation=self._precipitation_total,
+            native_pressure=self._pressure_total / self._count,
+            native_temperature=self._temperature_max,
+            native_templow=self._temperature_min,
+            native_wind_speed=self._wind_speed_total / self._count,
+            precipitation_probability=self._precipitation_probability_max,
+            uv_index=self._uv_index_max,
+            wind_bearing=round(wind_bearing) % 360,
+        )
+
+
+def parse_forecast(
+    payload: bytes, previous: CompactForecast | None
+) -> tuple[CompactForecast, ForecastViews | None]:
+    """Parse a forecast response from the WeatherXM API.
+
+    This doesn't use the event loop, so it can be run in an executor for large
+    responses.
+
+    Returns:
+        The compact forecast, and the views of the forecast if it differs from the
+        previous forecast.
+    """
+    wxm_forecast = pywxm.WeatherForecast.unmarshal(json_loads(payload))  # type: ignore[arg-type]
+    _LOGGER.debug("Updated weather forecast: %s", wxm_forecast)
+    forecast = CompactForecast.from_wxm(wxm_forecast)
+    # Only index the forecast when it has actually changed.
+    if forecast == previous:
+        return forecast, None
+    return forecast, ForecastViews.from_compact(forecast)
+
+
+def timed_parse_forecast(
+    payload: bytes, previous: CompactForecast | None
+) -> tuple[CompactForecast, ForecastViews | None, float]:
+    """Parse a forecast response, also returning the seconds taken to parse it."""
+    start = time.perf_counter()
+    forecast, views = parse_forecast(payload, previous)
+    return forecast, views, time.perf_counter() - start
+
+
+def _column_bytes(
+    columns: DayColumns | HourColumns, start: int, end: int
+) -> tuple[bytes, ...]:
+    return tuple(column[start:end].tobytes() for column in columns)
+
+
+def _local_midnight(forecast_date: datetime.date, timezone: str) -> float:
+    # Home Assistant caches time zone lookups, so avoid constructing new ZoneInfo
+    # instances for every forecast conversion.
+    return datetime.datetime.combine(
+        forecast_date, datetime.time(), dt_util.get_time_zone(timezone) or datetime.UTC
+    ).timestamp()
+
+
+def condition_wxm_to_ha(icon: str) -> str | None:  # noqa: C901, PLR0911
+    """Convert a WeatherXM 'icon' into a Home Assistant condition."""
+    if icon in ("clear-day", "extreme-day"):
+        return "sunny"
+    if icon in ("clear-night", "extreme-night"):
+        return "clear-night"
+    if icon.startswith("thunderstorms"):
+        # All WeatherXM thunderstorm conditions include some degree of rain
+        return "lightning-rainy"
+    if icon.endswith("extreme-rain"):
+        return "pouring"
+    if icon.endswith(("drizzle", "rain")):
+        return "rainy"
+    if icon.endswith("snow"):
+        return "snowy"
+    if icon.endswith("sleet"):
+        return "snowy-rainy"
+    # These startswith conditions must be at the bottom since they are more general
+    if icon.startswith("partly-cloudy"):
+        return "partlycloudy"
+    if icon.startswith(("overcast", "cloudy")):
+        return "cloudy"
+    if icon.startswith(("haze", "fog")):
+        return "fog"
+    if icon.startswith(("dust", "wind")):
+        # Assumes dust is caused by wind...
+        return "windy"
+    return None
+
+
+def _hourly_wxm_to_ha(forecast: CompactForecast, i: int) -> weather.Forecast:
+    hours = forecast.hours
+    return weather.Forecast(
+        datetime=dt_util.utc_from_timestamp(hours.timestamp[i]).isoformat(),
+        condition=condition_wxm_to_ha(forecast.icons[hours.icon[i]]),
+        humidity=hours.humidity[i],
+        native_apparent_temperature=hours.feels_like_temperature[i],
+        native_precipitation=hours.precipitation[i],
+        native_pressure=hours.pressure[i],
+        native_temperature=hours.temperature[i],
+        native_wind_speed=hours.wind_speed[i],
+        precipitation_probability=hours.precipitation_probability[i],
+        uv_index=hours.uv_index[i],
+        wind_bearing=hours.wind_direction[i],
+    )
+
+
+def _daily_wxm_to_ha(forecast: CompactForecast, i: int) -> weather.Forecast:
+    days = forecast.days
+    return weather.Forecast(
+        datetime=dt_util.utc_from_timestamp(days.timestamp[i]).isoformat(),
+        condition=condition_wxm_to_ha(forecast.icons[days.icon[i]]),
+        humidity=days.humidity[i],
+        native_precipitation=days.precipitation_intensity[i],
+        native_pressure=days.pressure[i],
+        native_temperature=days.temperature_max[i],
+        native_templow=days.temperature_min[i],
+        native_wind_speed=days.wind_speed[i],
+        precipitation_probability=days.precipitation_probability[i],
+        uv_index=days.uv_index[i],
+        wind_bearing=days.wind_direction[i],
+    )
@@ -0,0 +1,117 @@
+"""Historical observations from the WeatherXM API.
+
+History is requested one day at a time. Days which have finished in the weather
+station's time zone can't change, so they are kept in a bounded LRU cache and never
+requested again while cached.
+"""
+
+import asyncio
+import datetime
+import logging
+from collections import OrderedDict
+
+import pywxm
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .entities import WxmCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Enough for several months of history for a few weather stations.
+_MAX_CACHED_DAYS = 128
+
+_DayKey = tuple[str, datetime.date]
+"""A (device ID, station local date) pair."""
+
+
+class HistoryCache:
+    """Least recently used cache of the observations for each finished day."""
+
+    def __init__(self, max_days: int = _MAX_CACHED_DAYS) -> None:
+        self._max_days = max_days
+        self._days: OrderedDict[_DayKey, list[pywxm.HourlyWeatherData]] = OrderedDict()
+
+    def get(self, key: _DayKey) -> list[pywxm.HourlyWeatherData] | None:
+        """Return the cached observations for a day, if available."""
+        if (observations := self._days.get(key)) is not None:
+            self._days.move_to_end(key)
+        return observations
+
+    def put(self, key: _DayKey, observations: list[pywxm.HourlyWeatherData]) -> None:
+        """Cache the observations for a finished day."""
+        self._days[key] = observations
+        self._days.move_to_end(key)
+        while len(self._days) > self._max_days:
+            self._days.popitem(last=False)
+
+
+_DATA_HISTORY_CACHE: HassKey[HistoryCache] = HassKey(f"{DOMAIN}_history")
+
+
+async def async_get_history(
+    hass: HomeAssistant,
+    coordinator: WxmCoordinator,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> list[pywxm.HourlyWeatherData]:
+    """Return the observations reported by a weather station between two times.
+
+    Days which aren't cached are requested concurrently, limited by the account's
+    concurrent request limit.
+    """
+    cache: HistoryCache | None = hass.data.get(_DATA_HISTORY_CACHE)
+    if cache is None:
+        cache = hass.data[_DATA_HISTORY_CACHE] = HistoryCache()
+
+    device: pywxm.WxmDevice = coordinator.data
+    timezone = dt_util.get_time_zone(device.timezone) or dt_util.UTC
+    first_date = start.astimezone(timezone).date()
+    last_date = end.astimezone(timezone).date()
+    today = dt_util.now(timezone).date()
+
+    async def _async_get_day(date: datetime.date) -> list[pywxm.HourlyWeatherData]:
+        key = (device.id, date)
+        if (observations := cache.get(key)) is not None:
+            return observations
+        observations = await _async_fetch_day(coordinator, date)
+        if date < today:
+            cache.put(key, observations)
+        return observations
+
+    days = await asyncio.gather(
+        *(
+            _async_get_day(first_date + datetime.timedelta(days=i))
+            for i in range((last_date - first_date).days + 1)
+        )
+    )
+    return [
+        observation
+        for observations in days
+        for observation in observations
+        if start <= observation.timestamp <= end
+    ]
+
+
+async def _async_fetch_day(
+    coordinator: WxmCoordinator, date: datetime.date
+) -> list[pywxm.HourlyWeatherData]:
+    """Fetch the observations for a single station local date."""
+    try:
+        async with coordinator.account.async_request():
+            data = await coordinator.wxm_api.get_history(
+                coordinator.device_id, date, date
+            )
+            observations = [
+                pywxm.HourlyWeatherData.unmarshal(observation)
+                for day in data
+                for observation in day.get("hourly", [])
+            ]
+    except pywxm.AuthenticationError as e:
+        raise HomeAssistantError(f"Error authenticating with WeatherXM: {e}") from e
+
+    _LOGGER.debug("Fetched history for %s on %s", coordinator.device_id, date)
+    return observations
@@ -0,0 +1,98 @@
+"""Nowcasts blending the latest observation with the hourly forecast.
+
+Between observations a nowcast follows the hourly forecast, offset by the difference
+between the latest observation and the forecast at the time it was observed. The
+offset fades out over a few hours, so an old observation gradually gives way to the
+forecast. Nowcasts are calculated locally and never request data from the API.
+"""
+
+import bisect
+import datetime
+import math
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
+
+import pywxm
+
+if TYPE_CHECKING:
+    from .forecast import HourColumns
+
+# Forecast errors persist for a while, but a few hours after an observation the
+# forecast is a better estimate than the observation.
+_OFFSET_DECAY = datetime.timedelta(hours=3)
+
+
+class NowcastVariable(NamedTuple):
+    """A weather variable which is both observed and forecast hourly."""
+
+    observed: Callable[[pywxm.HourlyWeatherData], float]
+    forecast: "Callable[[HourColumns], Sequence[float]]"
+    bounds: tuple[float, float] = (-math.inf, math.inf)
+    """The physically possible range of values, which nowcasts are clamped to."""
+
+
+TEMPERATURE = NowcastVariable(
+    observed=lambda o: o.temperature, forecast=lambda h: h.temperature
+)
+APPARENT_TEMPERATURE = NowcastVariable(
+    observed=lambda o: o.apparent_temperature,
+    forecast=lambda h: h.feels_like_temperature,
+)
+HUMIDITY = NowcastVariable(
+    observed=lambda o: o.humidity, forecast=lambda h: h.humidity, bounds=(0, 100)
+)
+WIND_SPEED = NowcastVariable(
+    observed=lambda o: o.wind_speed,
+    forecast=lambda h: h.wind_speed,
+    bounds=(0, math.inf),
+)
+PRESSURE = NowcastVariable(
+    observed=lambda o: o.absolute_pressure,
+    forecast=lambda h: h.pressure,
+    bounds=(0, math.inf),
+)
+
+
+def nowcast(
+    variable: NowcastVariable,
+    observation: pywxm.HourlyWeatherData,
+    hours: "HourColumns | None",
+    now: float,
+) -> float:
+    """Estimate the value of a variable at a POSIX timestamp.
+
+    The observed value is returned unchanged if the forecast doesn't cover both the
+    observation time and the current time.
+    """
+    observed = variable.observed(observation)
+    observed_at = observation.timestamp.timestamp()
+    if hours is None or now <= observed_at:
+        return observed
+
+    values = variable.forecast(hours)
+    forecast_now = _interpolate(hours.timestamp, values, now)
+    forecast_observed = _interpolate(hours.timestamp, values, observed_at)
+    if forecast_now is None or forecast_observed is None:
+        return observed
+
+    weight = max(0.0, 1 - (now - observed_at) / _OFFSET_DECAY.total_seconds())
+    estimate = forecast_now + (observed - forecast_observed) * weight
+    # The offset can push the estimate out of range, e.g. above 100% humidity.
+    lower, upper = variable.bounds
+    return min(max(estimate, lower), upper)
+
+
+def _interpolate(
+    timestamps: Sequence[float], values: Sequence[float], at: float
+) -> float | None:
+    """Linearly interpolate between the forecasts either side of a timestamp."""
+    i = bisect.bisect_left(timestamps, at)
+    if i == len(timestamps):
+        return None
+    if timestamps[i] == at:
+        return values[i]
+    if i == 0:
+        return None
+    t0, t1 = timestamps[i - 1], timestamps[i]
+    fraction = (at - t0) / (t1 - t0)
+    return values[i - 1] + (values[i] - values[i - 1]) * fraction
@@ -0,0 +1,192 @@
+"""Profiling of the integration's hot paths, for the weatherxm.profile action.
+
+This module is only imported when a profile is requested.
+"""
+
+import asyncio
+import datetime
+import functools
+import inspect
+import logging
+import pathlib
+import time
+import tracemalloc
+import types
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import entities, forecast
+from .const import DOMAIN
+from .weather import WxmWeatherEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+_TOP_ALLOCATIONS = 25
+
+
+async def async_run_profile(hass: HomeAssistant, duration: int) -> None:
+    """Profile the integration for the duration and write a report."""
+    started = dt_util.now()
+    profiler = _Profiler()
+    # The integration's own methods are only wrapped while profiling, so there is
+    # no overhead at other times.
+    profiler.start()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.stop()
+
+    path = pathlib.Path(
+        hass.config.path(f"weatherxm_profile_{started:%Y%m%d_%H%M%S}.txt")
+    )
+    await hass.async_add_executor_job(
+        functools.partial(profiler.write_report, path, started, duration)
+    )
+    _LOGGER.info("WeatherXM profile written to %s", path)
+    persistent_notification.async_create(
+        hass,
+        f"WeatherXM profile written to {path}",
+        title="WeatherXM profile",
+        notification_id=f"{DOMAIN}_profile",
+    )
+
+
+class _Profiler:
+    """Records call timings and allocations for the integration's hot paths."""
+
+    def __init__(self) -> None:
+        # Appending is atomic, so samples can be recorded from executor threads.
+        self._samples: list[tuple[str, float]] = []
+        self._restore: list[Callable[[], None]] = []
+        self._started_tracemalloc = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        """Start profiling."""
+        for owner, name in (
+            (entities.WxmCoordinator, "_async_update_data"),
+            (entities.WxmRewardsCoordinator, "_async_update_data"),
+            (entities.WxmForecastCoordinator, "_async_update_data"),
+            (forecast, "parse_forecast"),
+            (forecast.CompactForecast, "from_wxm"),
+            (forecast.ForecastViews, "from_compact"),
+            (forecast.ForecastViews, "select"),
+            (WxmWeatherEntity, "async_forecast_hourly"),
+            (WxmWeatherEntity, "async_forecast_daily"),
+            (WxmWeatherEntity, "async_forecast_twice_daily"),
+            (WxmWeatherEntity, "async_write_ha_state"),
+            (entities.WxmEntity, "async_write_ha_state"),
+            (entities.WxmRewardsEntity, "async_write_ha_state"),
+        ):
+            self._patch(owner, name)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        """Stop profiling and restore the original methods."""
+        for restore in reversed(self._restore):
+            restore()
+        self._restore.clear()
+
+        if tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(
+                        inclusive=True,
+                        filename_pattern=str(pathlib.Path(entities.__file__).parent)
+                        + "/*",
+                    ),
+                    tracemalloc.Filter(inclusive=True, filename_pattern="*/pywxm/*"),
+                ]
+            )
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def write_report(
+        self, path: pathlib.Path, started: datetime.datetime, duration: int
+    ) -> None:
+        """Write the profile report to a file."""
+        timings: defaultdict[str, list[float]] = defaultdict(list)
+        for label, seconds in self._samples:
+            timings[label].append(seconds)
+
+        lines = [
+            f"WeatherXM profile started {started.isoformat()} for {duration} s",
+            "",
+            "Call timings (wall clock, including time awaiting I/O)",
+            (
+                f"{'Function':<50} {'Calls':>7} {'Total ms':>10} {'Mean ms':>10}"
+                f" {'Max ms':>10}"
+            ),
+        ]
+        for label, samples in sorted(
+            timings.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            total_ms = sum(samples) * 1000
+            lines.append(
+                f"{label:<50} {len(samples):>7} {total_ms:>10.2f}"
+                f" {total_ms / len(samples):>10.2f} {max(samples) * 1000:>10.2f}"
+            )
+        if not timings:
+            lines.append("No calls recorded")
+
+        lines += [
+            "",
+            f"Top {_TOP_ALLOCATIONS} allocations still held, by line",
+        ]
+        if self._snapshot is None:
+            lines.append("Allocations were not traced")
+        else:
+            lines += [
+                str(stat)
+                for stat in self._snapshot.statistics("lineno")[:_TOP_ALLOCATIONS]
+            ]
+
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def _patch(self, owner: type | types.ModuleType, name: str) -> None:
+        """Replace a function or method with one which records its timing."""
+        original = inspect.getattr_static(owner, name)
+        if name in vars(owner):
+            self._restore.append(functools.partial(setattr, owner, name, original))
+        else:
+            # Inherited, so removing the wrapper restores the base implementation.
+            self._restore.append(functools.partial(delattr, owner, name))
+
+        is_classmethod = isinstance(original, classmethod)
+        func = original.__func__ if is_classmethod else original
+        # Modules are labelled by their last component, like classes.
+        label = f"{owner.__name__.rsplit('.', 1)[-1]}.{name}"
+        wrapper = self._timed(func, label)
+        setattr(owner, name, classmethod(wrapper) if is_classmethod else wrapper)
+
+    def _timed(self, func: Callable[..., Any], label: str) -> Callable[..., Any]:
+        samples = self._samples
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: object, **kwargs: object) -> object:
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    samples.append((label, time.perf_counter() - start))
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: object, **kwargs: object) -> object:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append((label, time.perf_counter() - start))
+
+        return wrapper
@@ -0,0 +1,244 @@
+"""Long-term statistics of the rewards earned by each weather station.
+
+The first time a weather station is set up, its rewards history is imported from the
+WeatherXM rewards timeline. After that, each new reward is appended as it's
+received. The recorder is only imported if it is loaded, so that the integration
+works without it.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import Any, NamedTuple
+
+import pywxm
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .account import WxmRequestError
+from .const import DOMAIN
+from .entities import WxmCoordinators
+
+_LOGGER = logging.getLogger(__name__)
+
+_RECORDER = "recorder"
+_TIMELINE_PAGE_SIZE = 50
+# Rewards are earned daily, so this covers several years of history.
+_MAX_TIMELINE_PAGES = 50
+
+
+class RewardEvent(NamedTuple):
+    """A single reward from the rewards timeline."""
+
+    timestamp: datetime.datetime
+    total_reward: float
+    base_reward_score: int
+
+    @classmethod
+    def unmarshal(cls, data: dict[str, Any]) -> "RewardEvent":
+        """Create a reward from the JSON format returned by the WeatherXM API."""
+        return RewardEvent(
+            timestamp=datetime.datetime.fromisoformat(data["timestamp"]),
+            total_reward=data["total_reward"],
+            base_reward_score=data["base_reward_score"],
+        )
+
+    @property
+    def start(self) -> datetime.datetime:
+        """Start of the statistics period containing the reward."""
+        return dt_util.as_utc(self.timestamp).replace(minute=0, second=0, microsecond=0)
+
+
+class RewardsStatistics:
+    """Records the rewards of a weather station as external statistics."""
+
+    def __init__(self, hass: HomeAssistant, coordinators: WxmCoordinators) -> None:
+        self._hass = hass
+        self._coordinator = coordinators.rewards
+        device: pywxm.WxmDevice = coordinators.device.data
+        self._name = device.friendly_name or device.name
+
+        object_id = slugify(self._coordinator.device_id)
+        self.rewards_statistic_id = f"{DOMAIN}:{object_id}_rewards"
+        self.data_quality_statistic_id = f"{DOMAIN}:{object_id}_data_quality"
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_start(self) -> None:
+        """Import the rewards history, then record new rewards as they are received."""
+        config_entry = self._coordinator.config_entry
+        # The rewards co-ordinator only notifies listeners when the rewards change.
+        config_entry.async_on_unload(
+            self._coordinator.async_add_listener(self._async_schedule_update)
+        )
+        self._async_schedule_update()
+
+    @callback
+    def _async_schedule_update(self) -> None:
+        self._coordinator.config_entry.async_create_background_task(
+            self._hass,
+            self._async_update(),
+            name=f"WeatherXM rewards statistics {self._coordinator.device_id}",
+        )
+
+    async def _async_update(self) -> None:
+        if _RECORDER not in self._hass.config.components:
+            return
+
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import (
+            get_last_statistics,
+        )
+
+        async with self._lock:
+            last_stats = await get_instance(self._hass).async_add_executor_job(
+                get_last_statistics,
+                self._hass,
+                1,
+                self.rewards_statistic_id,
+                True,  # noqa: FBT003
+                {"sum"},
+            )
+            if last_row := last_stats.get(self.rewards_statistic_id):
+                last_start = dt_util.utc_from_timestamp(last_row[0]["start"])
+                last_sum = last_row[0]["sum"] or 0.0
+            else:
+                last_start = None
+                last_sum = 0.0
+
+            rewards = self._coordinator.data
+            if rewards is None:
+                return
+            latest = rewards.latest_reward
+            latest_event = RewardEvent(
+                timestamp=latest.timestamp,
+                total_reward=latest.total_reward,
+                base_reward_score=latest.base_reward_score,
+            )
+            if last_start is not None and latest_event.start <= last_start:
+                return
+
+            # Only the latest reward is known from the co-ordinator, so fetch any
+            # earlier rewards which haven't been recorded yet from the timeline.
+            # Nothing is recorded if that fails, so that the gap is filled by the
+            # next attempt.
+            if (events := await self._async_fetch_unrecorded(last_start)) is None:
+                return
+            events.append(latest_event)
+            self._async_add_statistics(events, last_start, last_sum)
+
+    async def _async_fetch_unrecorded(
+        self, last_start: datetime.datetime | None
+    ) -> list[RewardEvent] | None:
+        """Fetch the rewards after the last recorded reward, or None on failure."""
+        try:
+            async with self._coordinator.account.async_request():
+                return await self._async_fetch_timeline(since=last_start)
+        except pywxm.AuthenticationError:
+            # Handled by the co-ordinators
+            return None
+        except WxmRequestError as e:
+            _LOGGER.warning("Error fetching rewards timeline: %s", e)
+            return None
+
+    async def _async_fetch_timeline(
+        self, since: datetime.datetime | None
+    ) -> list[RewardEvent]:
+        """Fetch rewards after a time, or all rewards if no time is given.
+
+        The timeline is returned newest first, so pages are fetched until a reward
+        at or before the time is found.
+        """
+        wxm_api = self._coordinator.wxm_api
+        events: list[RewardEvent] = []
+        for page in range(_MAX_TIMELINE_PAGES):
+            data = await wxm_api.get_rewards_timeline(
+                self._coordinator.device_id, page, _TIMELINE_PAGE_SIZE
+            )
+
+            page_events = [RewardEvent.unmarshal(e) for e in data.get("data", [])]
+            events.extend(page_events)
+            if (
+                not data.get("has_next_page")
+                or not page_events
+                or (since is not None and page_events[-1].start <= since)
+            ):
+                break
+
+        _LOGGER.debug(
+            "Fetched %d rewards for %s", len(events), self._coordinator.device_id
+        )
+        return events
+
+    @callback
+    def _async_add_statistics(
+        self,
+        events: list[RewardEvent],
+        last_start: datetime.datetime | None,
+        last_sum: float,
+    ) -> None:
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        # Statistics must be added in order, with at most one reward per period.
+        events_by_start = {
+            event.start: event
+            for event in events
+            if last_start is None or event.start > last_start
+        }
+        if not events_by_start:
+            return
+
+        rewards: list[StatisticData] = []
+        data_quality: list[StatisticData] = []
+        total = last_sum
+        for start, event in sorted(events_by_start.items()):
+            total += event.total_reward
+            rewards.append(
+                StatisticData(start=start, state=event.total_reward, sum=total)
+            )
+            data_quality.append(
+                StatisticData(
+                    start=start,
+                    mean=event.base_reward_score,
+                    min=event.base_reward_score,
+                    max=event.base_reward_score,
+                )
+            )
+
+        async_add_external_statistics(
+            self._hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{self._name} Rewards",
+                source=DOMAIN,
+                statistic_id=self.rewards_statistic_id,
+                unit_of_measurement="WXM",
+            ),
+            rewards,
+        )
+        async_add_external_statistics(
+            self._hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self._name} Data Quality",
+                source=DOMAIN,
+                statistic_id=self.data_quality_statistic_id,
+                unit_of_measurement=PERCENTAGE,
+            ),
+            data_quality,
+        )
+        _LOGGER.debug(
+            "Added %d rewards statistics for %s",
+            len(rewards),
+            self._coordinator.device_id,
+        )
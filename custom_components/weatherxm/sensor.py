@@ -3,6 +3,8 @@
 Sensor entities are created for current weather measurements.
 """
 
+import datetime
+from collections import Counter
 from collections.abc import Mapping
 from typing import Any
 
@@ -12,6 +14,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     DEGREE,
     PERCENTAGE,
+    EntityCategory,
     UnitOfIrradiance,
     UnitOfPrecipitationDepth,
     UnitOfPressure,
@@ -19,17 +22,26 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfVolumetricFlux,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import event
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
+from . import nowcast, usage
 from .entities import (
     WxmCoordinator,
     WxmCoordinators,
     WxmEntity,
+    WxmForecastCoordinator,
     WxmRewardsCoordinator,
     WxmRewardsEntity,
 )
 
+ATTR_REWARD_TIME = "reward_time"
+ATTR_DAILY_BUDGET = "daily_budget"
+
+_NOWCAST_INTERVAL = datetime.timedelta(minutes=1)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001
@@ -39,6 +51,7 @@ async def async_setup_entry(
     """Set up the WeatherXM sensors."""
     device_coordinator = config_entry.runtime_data.device
     rewards_coordinator = config_entry.runtime_data.rewards
+    forecast_coordinator = config_entry.runtime_data.forecast
     wxm_device: pywxm.WxmDevice = device_coordinator.data
 
     async_add_devices(
@@ -56,10 +69,25 @@ async def async_setup_entry(
             WxmAbsolutePressure(device_coordinator),
             WxmUvIndexEntity(device_coordinator),
             WxmSolarIrradianceEntity(device_coordinator),
+            # Rolling aggregate entities
+            WxmMaxWindGustEntity(device_coordinator),
+            WxmRollingPrecipitationEntity(device_coordinator),
+            WxmPressureTrendEntity(device_coordinator),
+            # Nowcast entities
+            WxmTemperatureNowcastEntity(device_coordinator, forecast_coordinator),
+            WxmApparentTemperatureNowcastEntity(
+                device_coordinator, forecast_coordinator
+            ),
+            WxmHumidityNowcastEntity(device_coordinator, forecast_coordinator),
+            WxmWindSpeedNowcastEntity(device_coordinator, forecast_coordinator),
+            WxmPressureNowcastEntity(device_coordinator, forecast_coordinator),
             # Rewards entities
             WxmTotalRewardsEntity(rewards_coordinator, wxm_device),
             WxmLatestRewardEntity(rewards_coordinator, wxm_device),
             WxmDataQualityEntity(rewards_coordinator, wxm_device),
+            # API usage entities
+            WxmAccountApiRequestsEntity(device_coordinator),
+            WxmStationApiRequestsEntity(device_coordinator),
         ]
     )
 
@@ -268,6 +296,236 @@ class WxmSolarIrradianceEntity(WxmEntity, sensor.SensorEntity):
         return self.current_weather.solar_irradiance
 
 
+class WxmMaxWindGustEntity(WxmEntity, sensor.SensorEntity):
+    """Sensor entity reporting the maximum wind gust speed over the last hour."""
+
+    _attr_name = "Max Wind Gust Speed (1h)"
+    _attr_device_class = sensor.SensorDeviceClass.WIND_SPEED
+    _attr_native_unit_of_measurement = UnitOfSpeed.METERS_PER_SECOND
+    _attr_state_class = sensor.SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: WxmCoordinator) -> None:
+        super().__init__(coordinator, id_suffix="_wind_gust_max_1h")
+
+    @property
+    def native_value(self) -> float | None:  # type: ignore[override]
+        return self.wxm_coordinator.aggregates.max_wind_gust.value
+
+
+class WxmRollingPrecipitationEntity(WxmEntity, sensor.SensorEntity):
+    """Sensor entity reporting the precipitation over the last 24 hours."""
+
+    _attr_name = "Precipitation (24h)"
+    _attr_device_class = sensor.SensorDeviceClass.PRECIPITATION
+    _attr_native_unit_of_measurement = UnitOfPrecipitationDepth.MILLIMETERS
+    _attr_state_class = sensor.SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: WxmCoordinator) -> None:
+        super().__init__(coordinator, id_suffix="_precipitation_24h")
+
+    @property
+    def native_value(self) -> float | None:  # type: ignore[override]
+        return self.wxm_coordinator.aggregates.precipitation.value
+
+
+class WxmPressureTrendEntity(WxmEntity, sensor.SensorEntity):
+    """Sensor entity reporting the change in air pressure over the last 3 hours."""
+
+    _attr_name = "Pressure Trend (3h)"
+    _attr_device_class = sensor.SensorDeviceClass.PRESSURE
+    _attr_native_unit_of_measurement = UnitOfPressure.HPA
+    _attr_state_class = sensor.SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+    _attr_icon = "mdi:trending-up"
+
+    def __init__(self, coordinator: WxmCoordinator) -> None:
+        super().__init__(coordinator, id_suffix="_pressure_trend_3h")
+
+    @property
+    def native_value(self) -> float | None:  # type: ignore[override]
+        return self.wxm_coordinator.aggregates.pressure_change.value
+
+
+class WxmNowcastEntity(WxmEntity, sensor.SensorEntity):
+    """Base class for sensor entities estimating a value between observations.
+
+    Nowcasts are updated every minute from the latest observation and the hourly
+    forecast already held by the forecast co-ordinator.
+    """
+
+    # Frequently updated and only useful with a forecast, so opt-in.
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = sensor.SensorStateClass.MEASUREMENT
+
+    _variable: nowcast.NowcastVariable
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+        *,
+        id_suffix: str,
+    ) -> None:
+        super().__init__(coordinator, id_suffix=id_suffix)
+        self._forecast_coordinator = forecast_coordinator
+        self._forecast_requested: datetime.datetime | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._attr_native_value = self._nowcast()
+        self.async_on_remove(
+            event.async_track_time_interval(
+                self.hass, self._async_update_nowcast, _NOWCAST_INTERVAL
+            )
+        )
+        self._async_request_forecast_if_old()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = self._nowcast()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_nowcast(self, _: datetime.datetime) -> None:
+        self._async_request_forecast_if_old()
+        # Only write the state if the estimate has changed, to avoid recording a
+        # new state every minute when the forecast is flat.
+        value = self._nowcast()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+    @callback
+    def _async_request_forecast_if_old(self) -> None:
+        """Fetch the forecast if it's old and not being polled for the weather entity.
+
+        Requests are made at most once per maximum forecast age, so an unavailable
+        API isn't requested every minute.
+        """
+        forecast = self._forecast_coordinator
+        now = dt_util.utcnow()
+        if not forecast.is_old or (
+            self._forecast_requested is not None
+            and now - self._forecast_requested < forecast.max_age
+        ):
+            return
+        self._forecast_requested = now
+        forecast.config_entry.async_create_background_task(
+            self.hass,
+            forecast.async_refresh_if_old(),
+            name=f"WeatherXM nowcast forecast {forecast.device_id}",
+        )
+
+    def _nowcast(self) -> float:
+        forecast = self._forecast_coordinator.data
+        value = nowcast.nowcast(
+            self._variable,
+            self.current_weather,
+            forecast.hours if forecast is not None else None,
+            dt_util.utcnow().timestamp(),
+        )
+        return round(value, 2)
+
+
+class WxmTemperatureNowcastEntity(WxmNowcastEntity):
+    """Sensor entity estimating the temperature between observations."""
+
+    _attr_name = "Temperature (Nowcast)"
+    _attr_device_class = sensor.SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_suggested_display_precision = 1
+    _variable = nowcast.TEMPERATURE
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+    ) -> None:
+        super().__init__(
+            coordinator, forecast_coordinator, id_suffix="_temperature_nowcast"
+        )
+
+
+class WxmApparentTemperatureNowcastEntity(WxmNowcastEntity):
+    """Sensor entity estimating the apparent temperature between observations."""
+
+    _attr_name = "Apparent Temperature (Nowcast)"
+    _attr_device_class = sensor.SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_suggested_display_precision = 1
+    _variable = nowcast.APPARENT_TEMPERATURE
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+    ) -> None:
+        super().__init__(
+            coordinator,
+            forecast_coordinator,
+            id_suffix="_apparent_temperature_nowcast",
+        )
+
+
+class WxmHumidityNowcastEntity(WxmNowcastEntity):
+    """Sensor entity estimating the humidity between observations."""
+
+    _attr_name = "Humidity (Nowcast)"
+    _attr_device_class = sensor.SensorDeviceClass.HUMIDITY
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 0
+    _variable = nowcast.HUMIDITY
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+    ) -> None:
+        super().__init__(
+            coordinator, forecast_coordinator, id_suffix="_humidity_nowcast"
+        )
+
+
+class WxmWindSpeedNowcastEntity(WxmNowcastEntity):
+    """Sensor entity estimating the wind speed between observations."""
+
+    _attr_name = "Wind Speed (Nowcast)"
+    _attr_device_class = sensor.SensorDeviceClass.WIND_SPEED
+    _attr_native_unit_of_measurement = UnitOfSpeed.METERS_PER_SECOND
+    _attr_suggested_display_precision = 1
+    _variable = nowcast.WIND_SPEED
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+    ) -> None:
+        super().__init__(
+            coordinator, forecast_coordinator, id_suffix="_wind_speed_nowcast"
+        )
+
+
+class WxmPressureNowcastEntity(WxmNowcastEntity):
+    """Sensor entity estimating the absolute air pressure between observations."""
+
+    _attr_name = "Pressure (Nowcast)"
+    _attr_device_class = sensor.SensorDeviceClass.PRESSURE
+    _attr_native_unit_of_measurement = UnitOfPressure.HPA
+    _attr_suggested_display_precision = 1
+    _variable = nowcast.PRESSURE
+
+    def __init__(
+        self,
+        coordinator: WxmCoordinator,
+        forecast_coordinator: WxmForecastCoordinator,
+    ) -> None:
+        super().__init__(
+            coordinator, forecast_coordinator, id_suffix="_absolute_pressure_nowcast"
+        )
+
+
 class WxmTotalRewardsEntity(WxmRewardsEntity, sensor.SensorEntity):
     """Sensor entity reporting the total rewards earned."""
 
@@ -290,6 +548,9 @@ class WxmTotalRewardsEntity(WxmRewardsEntity, sensor.SensorEntity):
 class WxmLatestRewardEntity(WxmRewardsEntity, sensor.SensorEntity):
     """Sensor entity reporting the latest reward earned."""
 
+    # Changes with every reward, so would create new attribute rows in the recorder.
+    _unrecorded_attributes = frozenset({ATTR_REWARD_TIME})
+
     _attr_name = "Latest Reward"
     _attr_state_class = sensor.SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "WXM"
@@ -307,12 +568,17 @@ class WxmLatestRewardEntity(WxmRewardsEntity, sensor.SensorEntity):
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:  # type: ignore[override]
-        return {"reward_time": self.rewards.latest_reward.timestamp}
+        return {
+            **(super().extra_state_attributes or {}),
+            ATTR_REWARD_TIME: self.rewards.latest_reward.timestamp,
+        }
 
 
 class WxmDataQualityEntity(WxmRewardsEntity, sensor.SensorEntity):
     """Sensor entity reporting the latest data quality."""
 
+    _unrecorded_attributes = frozenset({ATTR_REWARD_TIME})
+
     _attr_name = "Data Quality"
     _attr_state_class = sensor.SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
@@ -329,4 +595,73 @@ class WxmDataQualityEntity(WxmRewardsEntity, sensor.SensorEntity):
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:  # type: ignore[override]
-        return {"reward_time": self.rewards.latest_reward.timestamp}
+        return {
+            **(super().extra_state_attributes or {}),
+            ATTR_REWARD_TIME: self.rewards.latest_reward.timestamp,
+        }
+
+
+class WxmAccountApiRequestsEntity(WxmEntity, sensor.SensorEntity):
+    """Sensor entity reporting today's API requests for the station's account.
+
+    Requests are counted continuously, but the state is only updated along with
+    the observations to avoid a state change for every request.
+    """
+
+    # Counts change with every update, so would create new attribute rows in the
+    # recorder.
+    _unrecorded_attributes = frozenset({*usage.ENDPOINTS, ATTR_DAILY_BUDGET})
+
+    _attr_name = "Account API Requests Today"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = "requests"
+    _attr_icon = "mdi:counter"
+
+    def __init__(self, coordinator: WxmCoordinator) -> None:
+        super().__init__(coordinator, id_suffix="_account_api_requests")
+
+    @property
+    def native_value(self) -> int:  # type: ignore[override]
+        return self.wxm_coordinator.account.usage.requests_today
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:  # type: ignore[override]
+        api_usage = self.wxm_coordinator.account.usage
+        return {
+            **(super().extra_state_attributes or {}),
+            **api_usage.today,
+            ATTR_DAILY_BUDGET: api_usage.budget,
+        }
+
+
+class WxmStationApiRequestsEntity(WxmEntity, sensor.SensorEntity):
+    """Sensor entity reporting today's API requests for the weather station.
+
+    Requests which aren't for a specific station, such as refreshing access tokens,
+    are only included in the account requests.
+    """
+
+    _unrecorded_attributes = frozenset(usage.ENDPOINTS)
+
+    _attr_name = "API Requests Today"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = sensor.SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = "requests"
+    _attr_icon = "mdi:counter"
+
+    def __init__(self, coordinator: WxmCoordinator) -> None:
+        super().__init__(coordinator, id_suffix="_api_requests")
+
+    @property
+    def native_value(self) -> int:  # type: ignore[override]
+        return self._requests.total()
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:  # type: ignore[override]
+        return {**(super().extra_state_attributes or {}), **self._requests}
+
+    @property
+    def _requests(self) -> Counter[str]:
+        coordinator = self.wxm_coordinator
+        return coordinator.account.usage.device_today(coordinator.device_id)
@@ -0,0 +1,119 @@
+"""Services for the WeatherXM integration."""
+
+import dataclasses
+import datetime
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    import asyncio
+
+SERVICE_PROFILE = "profile"
+SERVICE_GET_HISTORY = "get_history"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_END = "end"
+ATTR_START = "start"
+
+_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+_GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Required(ATTR_END): cv.datetime,
+    }
+)
+
+# Each day of history is a separate request.
+_MAX_HISTORY_DAYS = 31
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the WeatherXM services."""
+    profile_tasks: set[asyncio.Task[None]] = set()
+
+    @callback
+    def _async_profile(call: ServiceCall) -> None:
+        if profile_tasks:
+            raise HomeAssistantError("A WeatherXM profile is already running")
+        # The profiler is only imported when it's needed.
+        from .profiler import async_run_profile
+
+        # Profiles can run for up to an hour, so the action returns straight away
+        # and the report is written in the background once the profile finishes.
+        task = hass.async_create_background_task(
+            async_run_profile(hass, call.data[ATTR_DURATION]), name="WeatherXM profile"
+        )
+        profile_tasks.add(task)
+        task.add_done_callback(profile_tasks.discard)
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        return await _async_history_response(hass, call)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=_PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=_GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def _async_history_response(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Return the observations for a weather station between two times."""
+    entry_id: str = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"{entry_id} is not a WeatherXM config entry")
+    if entry.state != ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"{entry.title} is not loaded")
+
+    # Times without a time zone are in the Home Assistant time zone.
+    start = dt_util.as_local(call.data[ATTR_START])
+    end = dt_util.as_local(call.data[ATTR_END])
+    if end < start:
+        raise ServiceValidationError("The end time must be after the start time")
+    if end - start > datetime.timedelta(days=_MAX_HISTORY_DAYS):
+        raise ServiceValidationError(
+            f"History can be requested for up to {_MAX_HISTORY_DAYS} days"
+        )
+
+    from .history import async_get_history
+
+    observations = await async_get_history(hass, entry.runtime_data.device, start, end)
+    return {
+        "observations": [
+            {
+                **dataclasses.asdict(observation),
+                "timestamp": observation.timestamp.isoformat(),
+            }
+            for observation in observations
+        ]
+    }
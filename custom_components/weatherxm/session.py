@@ -0,0 +1,71 @@
+"""A dedicated HTTP connection pool for WeatherXM API requests.
+
+All WeatherXM accounts, and the config flow, share a single connection pool which
+is separate from the pool Home Assistant shares between integrations. This keeps
+connections to the WeatherXM API warm across stations without WeatherXM requests
+competing with the traffic of other integrations.
+"""
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import ssl as ssl_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_DATA_CONNECTOR: HassKey[aiohttp.TCPConnector] = HassKey(f"{DOMAIN}_connector")
+
+# All requests are to a single host, so the limits are effectively the same.
+_CONNECTION_LIMIT = 10
+_CONNECTION_LIMIT_PER_HOST = 10
+# Stations are polled every few minutes, so keep idle connections open long enough
+# to be reused by other stations.
+_KEEPALIVE_SECONDS = 60.0
+_DNS_CACHE_SECONDS = 5 * 60
+
+
+@callback
+def async_get_connector(hass: HomeAssistant) -> aiohttp.TCPConnector:
+    """Return the connection pool used for WeatherXM API requests.
+
+    The pool is closed when Home Assistant stops.
+    """
+    connector: aiohttp.TCPConnector | None = hass.data.get(_DATA_CONNECTOR)
+    if connector is not None:
+        return connector
+
+    connector = hass.data[_DATA_CONNECTOR] = aiohttp.TCPConnector(
+        limit=_CONNECTION_LIMIT,
+        limit_per_host=_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=_KEEPALIVE_SECONDS,
+        ttl_dns_cache=_DNS_CACHE_SECONDS,
+        ssl=ssl_util.get_default_context(),
+    )
+
+    async def _async_close_connector(_: Event) -> None:
+        hass.data.pop(_DATA_CONNECTOR, None)
+        await connector.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_connector)
+    return connector
+
+
+@callback
+def async_create_session(
+    hass: HomeAssistant, trace_configs: list[aiohttp.TraceConfig] | None = None
+) -> aiohttp.ClientSession:
+    """Create a client session using the WeatherXM connection pool.
+
+    The caller is responsible for closing the session, which leaves the shared
+    connection pool open.
+    """
+    return aiohttp.ClientSession(
+        connector=async_get_connector(hass),
+        connector_owner=False,
+        headers={aiohttp.hdrs.USER_AGENT: SERVER_SOFTWARE},
+        json_serialize=json_dumps,
+        trace_configs=trace_configs,
+    )
@@ -0,0 +1,149 @@
+"""Transports which push device updates to the integration.
+
+Polling the WeatherXM API remains the fallback whenever no push transport is
+configured, or whenever pushed updates stop arriving.
+"""
+
+import asyncio
+import datetime
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+import pywxm
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import event
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+_HEARTBEAT_SECONDS = 30
+_HEALTH_CHECK_INTERVAL = datetime.timedelta(minutes=1)
+# Stations normally report every 5 minutes, so allow a few missed reports before
+# assuming the push source has stalled.
+_STALE_AFTER = datetime.timedelta(minutes=15)
+_MIN_RECONNECT_DELAY = 5
+_MAX_RECONNECT_DELAY = 300
+
+DeviceUpdateCallback = Callable[[pywxm.WxmDevice], None]
+
+
+class DeviceTransport(ABC):
+    """A source of pushed WeatherXM device updates."""
+
+    @property
+    @abstractmethod
+    def healthy(self) -> bool:
+        """Whether device updates are currently being received."""
+
+    @abstractmethod
+    def async_start(self, on_update: DeviceUpdateCallback) -> None:
+        """Start delivering device updates to the callback."""
+
+    @abstractmethod
+    async def async_stop(self) -> None:
+        """Stop delivering device updates."""
+
+
+class WebSocketTransport(DeviceTransport):
+    """Receives device updates from a WebSocket push source.
+
+    After connecting, the transport sends a subscription message of the form
+    ``{"subscribe": "<device id>"}``. Each text message received must contain a
+    device in the same JSON format returned by the WeatherXM device API.
+    Messages for other devices are ignored.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry[Any],
+        session: aiohttp.ClientSession,
+        url: str,
+        device_id: str,
+    ) -> None:
+        self._hass = hass
+        self._config_entry = config_entry
+        self._session = session
+        self.url = url
+        self._device_id = device_id
+
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._last_message: datetime.datetime | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._unsub_health_check: Callable[[], None] | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self._ws is not None
+            and self._last_message is not None
+            and dt_util.utcnow() - self._last_message < _STALE_AFTER
+        )
+
+    @callback
+    def async_start(self, on_update: DeviceUpdateCallback) -> None:
+        self._task = self._config_entry.async_create_background_task(
+            self._hass,
+            self._async_run(on_update),
+            name=f"WeatherXM push {self._device_id}",
+        )
+        self._unsub_health_check = event.async_track_time_interval(
+            self._hass, self._async_check_health, _HEALTH_CHECK_INTERVAL
+        )
+
+    async def async_stop(self) -> None:
+        if self._unsub_health_check:
+            self._unsub_health_check()
+            self._unsub_health_check = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self, on_update: DeviceUpdateCallback) -> None:
+        reconnect_delay = _MIN_RECONNECT_DELAY
+        while True:
+            try:
+                async with self._session.ws_connect(
+                    self.url, heartbeat=_HEARTBEAT_SECONDS
+                ) as ws:
+                    await ws.send_json({"subscribe": self._device_id})
+                    _LOGGER.debug("Connected to push source %s", self.url)
+                    self._ws = ws
+                    self._last_message = dt_util.utcnow()
+                    reconnect_delay = _MIN_RECONNECT_DELAY
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_message(msg.data, on_update)
+            except (aiohttp.ClientError, TimeoutError) as e:
+                _LOGGER.warning("Error receiving from push source %s: %s", self.url, e)
+            finally:
+                self._ws = None
+
+            _LOGGER.debug("Reconnecting to %s in %d seconds", self.url, reconnect_delay)
+            await asyncio.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, _MAX_RECONNECT_DELAY)
+
+    def _handle_message(self, data: str, on_update: DeviceUpdateCallback) -> None:
+        self._last_message = dt_util.utcnow()
+        try:
+            device = pywxm.WxmDevice.unmarshal(json_loads(data))  # type: ignore[arg-type]
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid message from push source: %s", data)
+            return
+        if device.id == self._device_id:
+            on_update(device)
+
+    async def _async_check_health(self, _: datetime.datetime) -> None:
+        """Force a reconnection if the push source has stopped sending updates."""
+        if self._ws is not None and not self.healthy:
+            _LOGGER.warning(
+                "No updates received from push source %s since %s, reconnecting",
+                self.url,
+                self._last_message,
+            )
+            await self._ws.close()
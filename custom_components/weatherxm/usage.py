@@ -0,0 +1,195 @@
+"""Accounting of the requests made to the WeatherXM API.
+
+Requests are counted by an aiohttp trace on each account's session, so every
+request is counted, including those made directly by pywxm such as logging in and
+refreshing access tokens. Daily counts reset at midnight UTC, and are saved so that
+they survive restarts.
+"""
+
+import asyncio
+import datetime
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import storage
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+ENDPOINT_LOGIN = "login"
+ENDPOINT_REFRESH = "refresh"
+ENDPOINT_LIST_DEVICES = "list_devices"
+ENDPOINT_GET_DEVICE = "get_device"
+ENDPOINT_GET_LATEST_REWARDS = "get_latest_rewards"
+ENDPOINT_GET_FORECAST = "get_forecast"
+ENDPOINT_GET_HISTORY = "get_history"
+ENDPOINT_GET_REWARDS_TIMELINE = "get_rewards_timeline"
+ENDPOINT_OTHER = "other"
+
+_DEVICE_ID = "{id}"
+
+# Paths are relative to the API base URL, with an optional device ID segment.
+# Matching segments is cheaper than compiling a regular expression per endpoint.
+_ENDPOINT_PATTERNS = tuple(
+    (method, tuple(path.split("/")), endpoint)
+    for method, path, endpoint in (
+        ("POST", "auth/login", ENDPOINT_LOGIN),
+        ("POST", "auth/refresh", ENDPOINT_REFRESH),
+        ("GET", "me/devices", ENDPOINT_LIST_DEVICES),
+        ("GET", f"me/devices/{_DEVICE_ID}", ENDPOINT_GET_DEVICE),
+        ("GET", f"devices/{_DEVICE_ID}/rewards", ENDPOINT_GET_LATEST_REWARDS),
+        ("GET", f"me/devices/{_DEVICE_ID}/forecast", ENDPOINT_GET_FORECAST),
+        ("GET", f"me/devices/{_DEVICE_ID}/history", ENDPOINT_GET_HISTORY),
+        (
+            "GET",
+            f"devices/{_DEVICE_ID}/rewards/timeline",
+            ENDPOINT_GET_REWARDS_TIMELINE,
+        ),
+    )
+)
+
+ENDPOINTS = (*(endpoint for _, _, endpoint in _ENDPOINT_PATTERNS), ENDPOINT_OTHER)
+"""All endpoints which requests are counted for."""
+
+_API_PATH_PREFIX = "/api/v1/"
+
+_USAGE_STORAGE_VERSION = 1
+# Avoid writing to disk for every request, the counts are also saved when Home
+# Assistant shuts down.
+_USAGE_SAVE_DELAY = 5 * 60
+
+
+def endpoint_for_request(method: str, path: str) -> tuple[str, str | None]:
+    """Return the endpoint and device ID (if any) for a request to the API."""
+    segments = path.removeprefix(_API_PATH_PREFIX).split("/")
+    for pattern_method, pattern, endpoint in _ENDPOINT_PATTERNS:
+        if method == pattern_method and len(segments) == len(pattern):
+            device_id = None
+            for segment, expected in zip(segments, pattern, strict=True):
+                if expected == _DEVICE_ID and segment:
+                    device_id = segment
+                elif segment != expected:
+                    break
+            else:
+                return endpoint, device_id
+    return ENDPOINT_OTHER, None
+
+
+class ApiUsage:
+    """Counts the requests made to the WeatherXM API by an account."""
+
+    def __init__(self, store: storage.Store[dict[str, Any]]) -> None:
+        self.budget: int | None = None
+        """The maximum number of requests per day, if limited."""
+        self.total: Counter[str] = Counter()
+        """Requests to each endpoint since Home Assistant started."""
+        self._store = store
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._date = dt_util.utcnow().date()
+        self._today: Counter[str] = Counter()
+        self._today_by_device: defaultdict[str, Counter[str]] = defaultdict(Counter)
+
+    async def async_load(self) -> None:
+        """Restore the counts saved earlier today, before a restart or reload.
+
+        Requests counted before the counts are loaded are added to them, and the
+        counts aren't saved until they have been loaded.
+        """
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            self._roll_over()
+            if data is not None and data["date"] == self._date.isoformat():
+                self._today.update(data["today"])
+                for device_id, counts in data["devices"].items():
+                    self._today_by_device[device_id].update(counts)
+            self._loaded = True
+            self._store.async_delay_save(self._data_to_save, _USAGE_SAVE_DELAY)
+
+    @property
+    def today(self) -> Counter[str]:
+        """Requests to each endpoint today."""
+        self._roll_over()
+        return self._today
+
+    @property
+    def requests_today(self) -> int:
+        """The total number of requests today."""
+        return self.today.total()
+
+    def device_today(self, device_id: str) -> Counter[str]:
+        """Requests to each endpoint today for a single weather station."""
+        self._roll_over()
+        return self._today_by_device.get(device_id, Counter())
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether today's requests have reached the daily budget."""
+        return self.budget is not None and self.requests_today >= self.budget
+
+    @property
+    def day_remaining(self) -> float:
+        """The fraction of the current UTC day which remains."""
+        now = dt_util.utcnow()
+        midnight = datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1), datetime.time(), datetime.UTC
+        )
+        remaining: float = (midnight - now) / datetime.timedelta(days=1)
+        return remaining
+
+    def record(self, method: str, path: str) -> None:
+        """Count a request to the API."""
+        self._roll_over()
+        endpoint, device_id = endpoint_for_request(method, path)
+        self.total[endpoint] += 1
+        self._today[endpoint] += 1
+        if device_id is not None:
+            self._today_by_device[device_id][endpoint] += 1
+        if self._loaded:
+            self._store.async_delay_save(self._data_to_save, _USAGE_SAVE_DELAY)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Create a trace config which counts the requests made by a session."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def _on_request_start(
+            _: aiohttp.ClientSession,
+            __: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            self.record(params.method, params.url.path)
+
+        # aiohttp's annotation of its signals predates aiosignal's generic Signal.
+        trace_config.on_request_start.append(_on_request_start)  # type: ignore[arg-type]
+        return trace_config
+
+    def _roll_over(self) -> None:
+        """Reset the daily counts at midnight UTC."""
+        if (date := dt_util.utcnow().date()) != self._date:
+            self._date = date
+            self._today.clear()
+            self._today_by_device.clear()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._roll_over()
+        return {
+            "date": self._date.isoformat(),
+            "today": dict(self._today),
+            "devices": {
+                device_id: dict(counts)
+                for device_id, counts in self._today_by_device.items()
+            },
+        }
+
+
+def usage_store(hass: HomeAssistant, account_id: str) -> storage.Store[dict[str, Any]]:
+    """Return the store used to persist the daily request counts for an account."""
+    return storage.Store(
+        hass, _USAGE_STORAGE_VERSION, f"{DOMAIN}.{slugify(account_id)}.usage"
+    )
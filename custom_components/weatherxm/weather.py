@@ -3,9 +3,9 @@
 A single weather entity is created for the configured weather station.
 """
 
-import datetime
-import zoneinfo
-from typing import cast
+from collections.abc import Mapping
+from functools import partial
+from typing import Any, cast
 
 import pywxm
 from homeassistant.components import weather
@@ -16,7 +16,7 @@ from homeassistant.const import (
     UnitOfSpeed,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
@@ -25,9 +25,9 @@ from .entities import (
     WxmCoordinators,
     WxmForecastCoordinator,
     device_info,
+    stale_attributes,
 )
-
-_MAX_HOURLY_FORECASTS = 48
+from .forecast import ForecastType, condition_wxm_to_ha
 
 
 async def async_setup_entry(
@@ -44,6 +44,7 @@ class WxmWeatherEntity(
         WxmCoordinator,
         WxmForecastCoordinator,
         WxmForecastCoordinator,
+        WxmForecastCoordinator,
     ]
 ):
     """Weather entity for a WeatherXM weather station."""
@@ -58,6 +59,7 @@ class WxmWeatherEntity(
     _attr_supported_features = (
         weather.WeatherEntityFeature.FORECAST_HOURLY
         | weather.WeatherEntityFeature.FORECAST_DAILY
+        | weather.WeatherEntityFeature.FORECAST_TWICE_DAILY
     )
 
     def __init__(self, coordinators: WxmCoordinators) -> None:
@@ -65,8 +67,11 @@ class WxmWeatherEntity(
             observation_coordinator=coordinators.device,
             daily_coordinator=coordinators.forecast,
             hourly_coordinator=coordinators.forecast,
+            twice_daily_coordinator=coordinators.forecast,
         )
         self.coordinators = coordinators
+        self._pushed_fingerprints: dict[ForecastType, int | None] = {}
+        self._initial_forecasts_pending: set[ForecastType] = set()
 
         self._attr_unique_id = coordinators.device.data.id
         self._attr_device_info = device_info(coordinators.device.data)
@@ -76,12 +81,12 @@ class WxmWeatherEntity(
         return cast(pywxm.WxmDevice, self.coordinators.device.data).current_weather
 
     @property
-    def _forecast(self) -> pywxm.WeatherForecast:
-        return cast(pywxm.WeatherForecast, self.coordinators.forecast.data)
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:  # type: ignore[override]
+        return stale_attributes(self.coordinators.device)
 
     @property
     def condition(self) -> str | None:  # type: ignore[override] # MyPy doesn't handle these property overrides.
-        return _condition_wxm_to_ha(self._current_weather.icon)
+        return condition_wxm_to_ha(self._current_weather.icon)
 
     @property
     def humidity(self) -> float | None:  # type: ignore[override]
@@ -120,97 +125,61 @@ class WxmWeatherEntity(
         return self._current_weather.wind_direction
 
     async def async_forecast_hourly(self) -> list[weather.Forecast] | None:
-        # Gather the available hourly forecast data from now for up to 48 hours
-        now = dt_util.now()
-        hourly_forecasts: list[weather.Forecast] = []
-        for f in self._forecast.forecast:
-            wxm_hourly_forecasts = f.hourly_forecasts or []
-            for hourly_forecast in wxm_hourly_forecasts:
-                if (
-                    hourly_forecast.timestamp > now
-                    and len(hourly_forecasts) < _MAX_HOURLY_FORECASTS
-                ):
-                    hourly_forecasts.append(_hourly_wxm_to_ha(hourly_forecast))
-
-        return hourly_forecasts
+        return await self._async_get_forecast("hourly")
 
     async def async_forecast_daily(self) -> list[weather.Forecast] | None:
-        # Gather the available daily forecast data
-        return [
-            _daily_wxm_to_ha(
-                forecast_timestamp=_to_timestamp(f.forecast_date, f.timezone),
-                wxm_forecast=f.daily_forecast,
+        return await self._async_get_forecast("daily")
+
+    async def async_forecast_twice_daily(self) -> list[weather.Forecast] | None:
+        return await self._async_get_forecast("twice_daily")
+
+    async def _async_get_forecast(
+        self, forecast_type: ForecastType
+    ) -> list[weather.Forecast] | None:
+        # Forecasts are only polled while subscribed, so may need to be fetched.
+        await self.coordinators.forecast.async_refresh_if_old()
+        if forecast_type in self._initial_forecasts_pending:
+            self._initial_forecasts_pending.discard(forecast_type)
+            self._pushed_fingerprints[forecast_type] = self._forecast_fingerprint(
+                forecast_type
             )
-            for f in self._forecast.forecast
-            if f.daily_forecast
-        ]
-
-
-def _condition_wxm_to_ha(icon: str) -> str | None:  # noqa: C901, PLR0911
-    """Convert a WeatherXM 'icon' into a Home Assistant condition."""
-    if icon in ("clear-day", "extreme-day"):
-        return "sunny"
-    if icon in ("clear-night", "extreme-night"):
-        return "clear-night"
-    if icon.startswith("thunderstorms"):
-        # All WeatherXM thunderstorm conditions include some degree of rain
-        return "lightning-rainy"
-    if icon.endswith("extreme-rain"):
-        return "pouring"
-    if icon.endswith(("drizzle", "rain")):
-        return "rainy"
-    if icon.endswith("snow"):
-        return "snowy"
-    if icon.endswith("sleet"):
-        return "snowy-rainy"
-    # These startswith conditions must be at the bottom since they are more general
-    if icon.startswith("partly-cloudy"):
-        return "partlycloudy"
-    if icon.startswith(("overcast", "cloudy")):
-        return "cloudy"
-    if icon.startswith(("haze", "fog")):
-        return "fog"
-    if icon.startswith(("dust", "wind")):
-        # Assumes dust is caused by wind...
-        return "windy"
-    return None
-
-
-def _hourly_wxm_to_ha(wxm_forecast: pywxm.HourlyForecast) -> weather.Forecast:
-    return weather.Forecast(
-        datetime=dt_util.as_utc(wxm_forecast.timestamp).isoformat(),
-        condition=_condition_wxm_to_ha(wxm_forecast.icon),
-        humidity=wxm_forecast.humidity,
-        native_apparent_temperature=wxm_forecast.feels_like_temperature,
-        native_precipitation=wxm_forecast.precipitation,
-        native_pressure=wxm_forecast.pressure,
-        native_temperature=wxm_forecast.temperature,
-        native_wind_speed=wxm_forecast.wind_speed,
-        precipitation_probability=wxm_forecast.precipitation_probability,
-        uv_index=wxm_forecast.uv_index,
-        wind_bearing=wxm_forecast.wind_direction,
-    )
-
-
-def _to_timestamp(forecast_date: datetime.date, timezone: str) -> datetime.datetime:
-    return datetime.datetime.combine(
-        forecast_date, datetime.time(), zoneinfo.ZoneInfo(timezone)
-    )
-
+        if (views := self.coordinators.forecast.views) is None:
+            return None
+        return views.select(forecast_type, dt_util.utcnow().timestamp())
+
+    def _forecast_fingerprint(self, forecast_type: ForecastType) -> int | None:
+        if (views := self.coordinators.forecast.views) is None:
+            return None
+        return views.fingerprint(forecast_type, dt_util.utcnow().timestamp())
+
+    @callback
+    def _async_subscription_started(self, forecast_type: ForecastType) -> None:
+        # Replaces the base class listener so that forecasts are only pushed to
+        # subscribers when their content has actually changed. The initial forecast
+        # is sent by Home Assistant when the subscription starts, which fetches the
+        # forecast first if there is none or it is old. The fingerprint is seeded
+        # from the forecast which is sent, so that fetch isn't pushed again.
+        self._pushed_fingerprints[forecast_type] = self._forecast_fingerprint(
+            forecast_type
+        )
+        self._initial_forecasts_pending.add(forecast_type)
+        self.unsub_forecast[forecast_type] = (
+            self.coordinators.forecast.async_add_listener(
+                partial(self._async_handle_forecast_update, forecast_type)
+            )
+        )
 
-def _daily_wxm_to_ha(
-    forecast_timestamp: datetime.datetime, wxm_forecast: pywxm.DailyForecast
-) -> weather.Forecast:
-    return weather.Forecast(
-        datetime=forecast_timestamp.astimezone(datetime.UTC).isoformat(),
-        condition=_condition_wxm_to_ha(wxm_forecast.icon),
-        humidity=wxm_forecast.humidity,
-        native_precipitation=wxm_forecast.precipitation_intensity,
-        native_pressure=wxm_forecast.pressure,
-        native_temperature=wxm_forecast.temperature_max,
-        native_templow=wxm_forecast.temperature_min,
-        native_wind_speed=wxm_forecast.wind_speed,
-        precipitation_probability=wxm_forecast.precipitation_probability,
-        uv_index=wxm_forecast.uv_index,
-        wind_bearing=wxm_forecast.wind_direction,
-    )
+    @callback
+    def _async_handle_forecast_update(self, forecast_type: ForecastType) -> None:
+        fingerprint = self._forecast_fingerprint(forecast_type)
+        if forecast_type in self._initial_forecasts_pending:
+            # Fetched for the initial forecast, which will include this update.
+            self._initial_forecasts_pending.discard(forecast_type)
+            self._pushed_fingerprints[forecast_type] = fingerprint
+            return
+        if fingerprint == self._pushed_fingerprints.get(forecast_type):
+            return
+        self._pushed_fingerprints[forecast_type] = fingerprint
+        self.coordinators.forecast.config_entry.async_create_task(
+            self.hass, self.async_update_listeners((forecast_type,))
+        )
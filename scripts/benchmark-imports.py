@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmarks the import time of the integration modules.
+
+Each module is imported in a fresh interpreter after pre-loading the Home Assistant
+modules which are already loaded by the time integrations are set up, so only the
+incremental cost of the integration is measured. Platform modules are measured with
+the integration package already imported, as Home Assistant always imports the
+package first. The modules are compiled first, so only loading cached bytecode is
+measured, and garbage collection is disabled. Fails if any module exceeds its import
+time budget.
+"""
+
+import argparse
+import compileall
+import pathlib
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Modules which Home Assistant has already imported when the integration loads.
+_PRELOADED_MODULES = [
+    "homeassistant.auth",
+    "homeassistant.config_entries",
+    "homeassistant.core",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.persistent_notification",
+    "homeassistant.components.sensor",
+    "homeassistant.components.weather",
+    "voluptuous",
+]
+
+_PACKAGE = "custom_components.weatherxm"
+
+# Incremental import time budget for each module in milliseconds: twice the median
+# measured before the integration grew its request budget, push, nowcast and rewards
+# statistics features (12.7 ms for the package, 0.5 ms for config_flow, 0.3 ms for
+# binary_sensor, 1.8 ms for sensor and 0.8 ms for weather), and at least 5 ms, as
+# smaller differences are lost in the noise of a fresh interpreter. The package
+# includes pywxm and the co-ordinator modules shared by every platform.
+_BUDGETS_MS = {
+    _PACKAGE: 25.0,
+    f"{_PACKAGE}.config_flow": 5.0,
+    f"{_PACKAGE}.diagnostics": 5.0,
+    f"{_PACKAGE}.binary_sensor": 5.0,
+    f"{_PACKAGE}.sensor": 5.0,
+    f"{_PACKAGE}.weather": 5.0,
+}
+
+
+@dataclass
+class Result:
+    """Import time measured for a module."""
+
+    module: str
+    import_time_ms: float
+    budget_ms: float
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the import time exceeded the budget."""
+        return self.import_time_ms > self.budget_ms
+
+
+def _measure(root: pathlib.Path, module: str) -> float:
+    """Return the incremental import time of the module in milliseconds.
+
+    This is the cumulative time reported for the module, which only includes the
+    modules it imports that weren't pre-loaded.
+    """
+    preloaded = (
+        _PRELOADED_MODULES if module == _PACKAGE else [*_PRELOADED_MODULES, _PACKAGE]
+    )
+    # Garbage collection is disabled, so that collecting Home Assistant's objects
+    # isn't measured as part of whichever module happened to trigger it.
+    preload = "; ".join(
+        ["import gc", "gc.disable()", *(f"import {m}" for m in preloaded)]
+    )
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"{preload}; import {module}"],
+        cwd=root,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+
+    # Lines have the form "import time: <self us> | <cumulative us> | <module>"
+    for line in output.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip() == module:  # noqa: PLR2004
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+parser = argparse.ArgumentParser("benchmark-imports.py")
+parser.add_argument("--runs", type=int, default=5)
+parser.add_argument(
+    "--root", type=str, default=str(pathlib.Path(__file__).parent.parent)
+)
+
+args = parser.parse_args()
+root = pathlib.Path(args.root)
+# Measure loading cached bytecode, as Home Assistant does, rather than compiling the
+# sources, even if writing bytecode is disabled.
+compileall.compile_dir(root / _PACKAGE.replace(".", "/"), quiet=1)
+
+results = [
+    Result(
+        module=module,
+        import_time_ms=statistics.median(
+            _measure(root, module) for _ in range(args.runs)
+        ),
+        budget_ms=budget_ms,
+    )
+    for module, budget_ms in _BUDGETS_MS.items()
+]
+
+for result in results:
+    print(  # noqa: T201
+        f"{result.module:<45} {result.import_time_ms:8.2f} ms"
+        f" (budget {result.budget_ms:.2f} ms)"
+    )
+
+errors = [r for r in results if r.over_budget]
+for err in errors:
+    print(  # noqa: T201
+        f"::error ::{err.module} import took {err.import_time_ms:.2f} ms,"
+        f" exceeding the {err.budget_ms:.2f} ms budget",
+        file=sys.stderr,
+    )
+sys.exit(len(errors))
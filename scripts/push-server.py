@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""A local stand-in push source for testing push updates offline.
+
+Serves a WebSocket which accepts the integration's subscription message and then
+periodically sends simulated observations for the subscribed weather station.
+Configure the integration's Push URL option as ws://<host>:<port>/ to use it.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import math
+import pathlib
+import random
+from typing import Any
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger("push-server")
+
+
+def _simulated_device(device_id: str) -> dict[str, Any]:
+    """Return a device in the WeatherXM device API format."""
+    return {
+        "id": device_id,
+        "name": "Simulated Station",
+        "relation": "owned",
+        "address": "Nowhere",
+        "timezone": "UTC",
+        "location": {"lat": 0.0, "lon": 0.0},
+        "bat_state": "ok",
+        "attributes": {"friendlyName": None, "firmware": {"current": "0.0.0"}},
+        "bundle": {"ws_model": "Simulator"},
+        "current_weather": {
+            "temperature": 20.0,
+            "feels_like": 20.0,
+            "dew_point": 10.0,
+            "humidity": 50,
+            "precipitation": 0.0,
+            "precipitation_accumulated": 0.0,
+            "wind_speed": 2.0,
+            "wind_gust": 4.0,
+            "wind_direction": 180,
+            "pressure": 1013.0,
+            "uv_index": 0,
+            "solar_irradiance": 0.0,
+            "icon": "clear-day",
+        },
+    }
+
+
+def _next_observation(device: dict[str, Any]) -> dict[str, Any]:
+    """Return the device with a new simulated observation."""
+    now = datetime.datetime.now(datetime.UTC)
+    weather = dict(device["current_weather"])
+    daily_cycle = math.sin((now.hour + now.minute / 60 - 9) / 24 * 2 * math.pi)
+    precipitation = random.choice([0.0, 0.0, 0.0, random.uniform(0, 5)])  # noqa: S311
+    weather.update(
+        timestamp=now.isoformat(),
+        temperature=round(15 + 8 * daily_cycle + random.uniform(-0.5, 0.5), 1),  # noqa: S311
+        wind_speed=round(random.uniform(0, 6), 1),  # noqa: S311
+        wind_gust=round(random.uniform(2, 12), 1),  # noqa: S311
+        pressure=round(weather["pressure"] + random.uniform(-0.3, 0.3), 1),  # noqa: S311
+        precipitation=round(precipitation, 1),
+        precipitation_accumulated=round(
+            weather["precipitation_accumulated"] + precipitation / 12, 1
+        ),
+    )
+    return {**device, "current_weather": weather}
+
+
+async def _handle_websocket(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    subscription = await ws.receive_json()
+    device_id: str = subscription["subscribe"]
+    _LOGGER.info("Client subscribed to %s", device_id)
+
+    device: dict[str, Any] = request.app["device"] or _simulated_device(device_id)
+    device = {**device, "id": device_id}
+    while not ws.closed:
+        device = _next_observation(device)
+        await ws.send_str(json.dumps(device))
+        _LOGGER.info("Sent observation for %s", device_id)
+        await asyncio.sleep(request.app["interval"])
+    return ws
+
+
+parser = argparse.ArgumentParser("push-server.py")
+parser.add_argument("--host", type=str, default="localhost")
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument(
+    "--interval", type=float, default=60, help="Seconds between observations"
+)
+parser.add_argument(
+    "--device-file",
+    type=str,
+    help="JSON file containing a device from the WeatherXM device API to use as "
+    "the basis for simulated observations",
+)
+
+args = parser.parse_args()
+logging.basicConfig(level=logging.INFO)
+
+app = web.Application()
+app["interval"] = args.interval
+app["device"] = None
+if args.device_file:
+    with pathlib.Path(args.device_file).open() as f:
+        app["device"] = json.load(f)
+app.router.add_get("/", _handle_websocket)
+web.run_app(app, host=args.host, port=args.port)
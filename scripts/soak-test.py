@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""Soak tests the integration against a fake WeatherXM API in accelerated time.
+
+Home Assistant runs in-process on an event loop with a simulated clock. Whenever the
+loop is idle, the clock jumps to the next scheduled timer instead of waiting for it,
+so days of polling complete in seconds. Weather stations are added through the
+config flow and then run with all co-ordinators, token refreshes and the weather,
+sensor and binary sensor platforms.
+
+The fake API is served on a local port and counts the requests to each endpoint.
+The harness also counts entity state writes, the events a recorder would receive
+and the memory allocated over time. It fails if any of these exceed their budget.
+At the end of the run it checks that forecasts are available, and that a pushed
+update clears the stale data left by failed polls.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import dataclasses
+import datetime
+import gc
+import logging
+import math
+import pathlib
+import random
+import re
+import selectors
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from collections.abc import Callable
+from typing import Any, Self, TypeVar
+
+import jwt
+import pywxm.api
+import yarl
+from aiohttp import web
+from aiohttp.typedefs import Handler
+from homeassistant import bootstrap, config_entries, core, loader
+from homeassistant.components.weather.const import DATA_COMPONENT
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+    MATCH_ALL,
+)
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger("soak-test")
+
+_T = TypeVar("_T")
+
+DOMAIN = "weatherxm"
+ATTR_STALE_SINCE = "stale_since"
+
+_ACCESS_TOKEN_LIFETIME = datetime.timedelta(hours=1)
+# Tokens are only decoded without verification by pywxm.
+_TOKEN_KEY = "soak-test-" + "0" * 32
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    """The maximum allowed count for a metric."""
+
+    limit: float
+    per_station: bool = True
+    """Whether the limit applies to each weather station, or to the whole run."""
+    per_day: bool = True
+    """Whether the limit applies to each simulated day, or to the whole run."""
+
+    def scaled(self, stations: int, days: float) -> float:
+        """Return the limit for the whole run."""
+        return (
+            self.limit
+            * (stations if self.per_station else 1)
+            * (days if self.per_day else 1)
+        )
+
+
+# Based on the default poll intervals, with some headroom.
+_API_CALL_BUDGETS = {
+    "GET me/devices/{id}": Budget(300),
+    "GET devices/{id}/rewards": Budget(100),
+    # Forecasts are only polled while subscribed.
+    "GET me/devices/{id}/forecast": Budget(100),
+    # Access tokens expire hourly, and each weather station has its own client.
+    "POST auth/refresh": Budget(30),
+    # Only requested by the config flow when each weather station is added.
+    "POST auth/login": Budget(1, per_day=False),
+    "GET me/devices": Budget(1, per_day=False),
+}
+
+
+class VirtualClock:
+    """A monotonic clock which can jump ahead of real time."""
+
+    def __init__(self) -> None:
+        self._offset = 0.0
+        self._start_monotonic = time.monotonic()
+        self._start_wall = time.time()
+
+    def monotonic(self) -> float:
+        """Return the current monotonic time."""
+        return time.monotonic() + self._offset
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self._offset += seconds
+
+    @property
+    def elapsed(self) -> datetime.timedelta:
+        """Simulated time since the clock was created."""
+        return datetime.timedelta(seconds=self.monotonic() - self._start_monotonic)
+
+    def utcnow(self) -> datetime.datetime:
+        """Return the current simulated UTC time."""
+        return datetime.datetime.fromtimestamp(
+            self._start_wall + self.elapsed.total_seconds(), datetime.UTC
+        )
+
+
+class TimeWarpSelector(selectors.DefaultSelector):
+    """A selector which advances the virtual clock instead of blocking."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__()
+        self._clock = clock
+        self.executor_jobs = 0
+        """The number of executor jobs which haven't completed yet."""
+
+    def select(
+        self, timeout: float | None = None
+    ) -> list[tuple[selectors.SelectorKey, int]]:
+        """Return ready events, jumping to the next timer if there are none."""
+        # Executor jobs take real time, and wake the loop when they complete.
+        if self.executor_jobs:
+            return super().select(timeout)
+        # The fake API is served by the same loop, so responses are ready as soon
+        # as they are sent and the loop is only idle while waiting for a timer.
+        events = super().select(0)
+        if not events and timeout is not None:
+            self._clock.advance(timeout)
+        return events
+
+
+class TimeWarpEventLoop(asyncio.SelectorEventLoop):
+    """An event loop which runs on a virtual clock."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self._warp_selector = TimeWarpSelector(clock)
+        super().__init__(self._warp_selector)
+        self._clock = clock
+
+    def time(self) -> float:
+        """Return the virtual monotonic time."""
+        return self._clock.monotonic()
+
+    def run_in_executor(
+        self,
+        executor: concurrent.futures.Executor | None,
+        func: Callable[..., _T],
+        *args: object,
+    ) -> asyncio.Future[_T]:
+        """Run a function in an executor, pausing the clock until it completes."""
+        future = super().run_in_executor(executor, func, *args)
+        self._warp_selector.executor_jobs += 1
+
+        def _done(_: asyncio.Future[_T]) -> None:
+            self._warp_selector.executor_jobs -= 1
+
+        future.add_done_callback(_done)
+        return future
+
+
+def _patch_wall_clock(clock: VirtualClock) -> None:
+    """Make wall clock time used by the integration follow the virtual clock."""
+
+    class VirtualDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz: datetime.tzinfo | None = None) -> Self:
+            now = clock.utcnow()
+            return cls.fromtimestamp(now.timestamp(), tz or datetime.UTC)
+
+    # pywxm checks access token expiry using the datetime module.
+    vars(pywxm.api)["datetime"] = types.SimpleNamespace(
+        **{**vars(datetime), "datetime": VirtualDatetime}
+    )
+
+    def _now(time_zone: datetime.tzinfo | None = None) -> datetime.datetime:
+        return clock.utcnow().astimezone(time_zone or dt_util.get_default_time_zone())
+
+    vars(dt_util).update(utcnow=clock.utcnow, now=_now)
+
+
+class FakeWeatherXm:
+    """A fake WeatherXM API with simulated weather stations."""
+
+    def __init__(self, clock: VirtualClock, stations: int) -> None:
+        self._clock = clock
+        self.device_ids = [f"soak-station-{i:04d}" for i in range(stations)]
+        self._device_pattern = re.compile("|".join(map(re.escape, self.device_ids)))
+        self.calls: collections.Counter[str] = collections.Counter()
+        self._refresh_count = 0
+        self._temperature = dict.fromkeys(self.device_ids, 20.0)
+        self._forecast_cache: tuple[datetime.date, list[dict[str, Any]]] | None = None
+        self.device_failures = False
+        """Whether device requests fail, as when the API is unavailable."""
+
+        self.app = web.Application(middlewares=[self._count_calls])
+        self.app.router.add_post("/api/v1/auth/login", self._login)
+        self.app.router.add_post("/api/v1/auth/refresh", self._refresh)
+        self.app.router.add_get("/api/v1/me/devices", self._list_devices)
+        self.app.router.add_get("/api/v1/me/devices/{id}", self._get_device)
+        self.app.router.add_get("/api/v1/me/devices/{id}/forecast", self._forecast)
+        self.app.router.add_get("/api/v1/devices/{id}/rewards", self._rewards)
+
+    @web.middleware
+    async def _count_calls(
+        self, request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        path = request.path.removeprefix("/api/v1/")
+        self.calls[f"{request.method} {self._device_pattern.sub('{id}', path)}"] += 1
+        return await handler(request)
+
+    def _tokens(self) -> web.Response:
+        self._refresh_count += 1
+        expiry = self._clock.utcnow() + _ACCESS_TOKEN_LIFETIME
+        token = jwt.encode(
+            {"exp": int(expiry.timestamp())}, _TOKEN_KEY, algorithm="HS256"
+        )
+        return web.json_response(
+            {"token": token, "refreshToken": f"refresh-{self._refresh_count}"}
+        )
+
+    async def _login(self, _: web.Request) -> web.Response:
+        return self._tokens()
+
+    async def _refresh(self, _: web.Request) -> web.Response:
+        return self._tokens()
+
+    async def _list_devices(self, _: web.Request) -> web.Response:
+        return web.json_response([self.device(d) for d in self.device_ids])
+
+    async def _get_device(self, request: web.Request) -> web.Response:
+        if self.device_failures:
+            return web.Response(status=503)
+        return web.json_response(self.device(request.match_info["id"]))
+
+    async def _rewards(self, _: web.Request) -> web.Response:
+        today = self._clock.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        return web.json_response(
+            {
+                "total_rewards": 100 + today.toordinal() % 1000,
+                "latest": {
+                    "timestamp": today.isoformat(),
+                    "base_reward": 1.5,
+                    "total_business_boost_reward": None,
+                    "total_reward": 1.5,
+                    "base_reward_score": 90 + today.day % 10,
+                },
+            }
+        )
+
+    async def _forecast(self, _: web.Request) -> web.Response:
+        today = self._clock.utcnow().date()
+        if self._forecast_cache is None or self._forecast_cache[0] != today:
+            self._forecast_cache = (today, self._forecast_days(today))
+        return web.json_response(self._forecast_cache[1])
+
+    def device(self, device_id: str) -> dict[str, Any]:
+        """Return a station in the API's JSON format, with its latest observation."""
+        now = self._clock.utcnow()
+        # Stations report every 5 minutes.
+        timestamp = now.replace(
+            minute=now.minute - now.minute % 5, second=0, microsecond=0
+        )
+        hour = now.hour + now.minute / 60
+        self._temperature[device_id] = round(
+            15
+            + 8 * math.sin((hour - 9) / 24 * 2 * math.pi)
+            + random.uniform(-0.3, 0.3),  # noqa: S311
+            1,
+        )
+        return {
+            "id": device_id,
+            "name": device_id,
+            "relation": "owned",
+            "address": "Nowhere",
+            "timezone": "UTC",
+            "location": {"lat": 0.0, "lon": 0.0},
+            "bat_state": "ok",
+            "attributes": {"friendlyName": None, "firmware": {"current": "1.0.0"}},
+            "bundle": {"ws_model": "Soak"},
+            "current_weather": {
+                "timestamp": timestamp.isoformat(),
+                "temperature": self._temperature[device_id],
+                "feels_like": self._temperature[device_id],
+                "dew_point": 10.0,
+                "humidity": random.randint(40, 60),  # noqa: S311
+                "precipitation": 0.0,
+                "precipitation_accumulated": round(hour / 10, 1),
+                "wind_speed": round(random.uniform(0, 6), 1),  # noqa: S311
+                "wind_gust": round(random.uniform(2, 12), 1),  # noqa: S311
+                "wind_direction": random.randint(0, 359),  # noqa: S311
+                "pressure": round(1013 + random.uniform(-2, 2), 1),  # noqa: S311
+                "uv_index": 0,
+                "solar_irradiance": 0.0,
+                "icon": "clear-day",
+            },
+        }
+
+    def _forecast_days(self, today: datetime.date) -> list[dict[str, Any]]:
+        days = []
+        for offset in range(8):
+            date = today + datetime.timedelta(days=offset)
+            midnight = datetime.datetime.combine(date, datetime.time(), datetime.UTC)
+            hourly = [
+                {
+                    "timestamp": (midnight + datetime.timedelta(hours=h)).isoformat(),
+                    "temperature": 15 + 8 * math.sin((h - 9) / 24 * 2 * math.pi),
+                    "feels_like": 15 + 8 * math.sin((h - 9) / 24 * 2 * math.pi),
+                    # Fractional values for the columns stored as integers.
+                    "humidity": 50.4,
+                    "pressure": 1013.0,
+                    "precipitation": 0.0,
+                    "precipitation_probability": 12.5,
+                    "wind_speed": 3.0,
+                    "wind_direction": 180.6,
+                    "uv_index": 2.7 if 8 <= h <= 16 else 0,  # noqa: PLR2004
+                    "icon": "clear-day" if 6 <= h < 18 else "clear-night",  # noqa: PLR2004
+                }
+                for h in range(24)
+            ]
+            daily = {
+                "timestamp": midnight.isoformat(),
+                "temperature_min": 7.0,
+                "temperature_max": 23.0,
+                "humidity": 50,
+                "pressure": 1013.0,
+                "precipitation_probability": 10,
+                "precipitation_intensity": 0.0,
+                "precipitation_type": "rain",
+                "wind_speed": 3.0,
+                "wind_direction": 180,
+                "uv_index": 5,
+                "icon": "clear-day",
+            }
+            days.append(
+                {
+                    "date": date.isoformat(),
+                    "tz": "UTC",
+                    "hourly": hourly,
+                    "daily": daily,
+                }
+            )
+        return days
+
+
+@dataclasses.dataclass
+class Metrics:
+    """Measurements taken from Home Assistant during the soak test."""
+
+    state_writes: int = 0
+    state_changes: int = 0
+    recorder_events: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    memory_samples: list[tuple[float, int]] = dataclasses.field(default_factory=list)
+    """(Simulated hours, traced memory in bytes) pairs."""
+    entities_without_forecasts: list[str] = dataclasses.field(default_factory=list)
+    """Weather entities which couldn't provide an hourly forecast at the end."""
+    entities_stale_after_push: list[str] = dataclasses.field(default_factory=list)
+    """Entities still reporting stale data after a pushed update."""
+
+    @core.callback
+    def async_listen(self, hass: core.HomeAssistant) -> None:
+        """Start counting events."""
+
+        @core.callback
+        def _any_state(_: Any) -> bool:  # noqa: ANN401
+            return True
+
+        @core.callback
+        def _state_reported(_: core.Event[Any]) -> None:
+            self.state_writes += 1
+
+        @core.callback
+        def _state_changed(_: core.Event[Any]) -> None:
+            self.state_writes += 1
+            self.state_changes += 1
+
+        # The recorder listens to all events, which excludes state reported events.
+        @core.callback
+        def _any_event(event: core.Event[Any]) -> None:
+            self.recorder_events[str(event.event_type)] += 1
+
+        # Listening to state reported events requires a filter.
+        hass.bus.async_listen(
+            EVENT_STATE_REPORTED, _state_reported, event_filter=_any_state
+        )
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+        hass.bus.async_listen(MATCH_ALL, _any_event)
+
+    @property
+    def memory_growth(self) -> int:
+        """Memory growth in bytes after the first simulated day."""
+        warmed_up = [m for hours, m in self.memory_samples if hours >= 24]  # noqa: PLR2004
+        samples = warmed_up or [m for _, m in self.memory_samples]
+        return samples[-1] - samples[0]
+
+
+async def _async_setup_hass(config_dir: pathlib.Path) -> core.HomeAssistant:
+    hass = core.HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    await hass.config.async_set_time_zone("UTC")
+    loader.async_setup(hass)
+    # Base functionality sets up the config entries, so they must exist first.
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def _async_add_station(hass: core.HomeAssistant, device_id: str) -> None:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "soak@example.com", CONF_PASSWORD: "soak"}
+    )
+    if result["type"] == "form":
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"device_id": device_id}
+        )
+    if result["type"] != "create_entry":
+        raise RuntimeError(f"Unable to add {device_id}: {result}")
+    await hass.async_block_till_done()
+
+
+def _subscribe_forecasts(hass: core.HomeAssistant) -> None:
+    """Subscribe to the hourly forecast of every weather entity, like a dashboard."""
+    component = hass.data[DATA_COMPONENT]
+    for entity in component.entities:
+        entity.async_subscribe_forecast("hourly", lambda _: None)
+
+
+async def _async_entities_without_forecasts(hass: core.HomeAssistant) -> list[str]:
+    """Return the weather entities which can't provide an hourly forecast."""
+    component = hass.data[DATA_COMPONENT]
+    return [
+        entity.entity_id
+        for entity in component.entities
+        if not await entity.async_forecast_hourly()
+    ]
+
+
+class PushSource:
+    """A device transport which delivers updates when they are pushed."""
+
+    healthy = True
+
+    def __init__(self) -> None:
+        self._on_update: Callable[[pywxm.WxmDevice], None] | None = None
+
+    def async_start(self, on_update: Callable[[pywxm.WxmDevice], None]) -> None:
+        """Start delivering device updates to the callback."""
+        self._on_update = on_update
+
+    async def async_stop(self) -> None:
+        """Stop delivering device updates."""
+        self._on_update = None
+
+    def push(self, device: pywxm.WxmDevice) -> None:
+        """Deliver a device update."""
+        if self._on_update is not None:
+            self._on_update(device)
+
+
+async def _async_entities_stale_after_push(
+    hass: core.HomeAssistant, backend: FakeWeatherXm
+) -> list[str]:
+    """Fail polls so entities report stale data, then push an update to each station.
+
+    Returns the entities which still report stale data.
+    """
+    backend.device_failures = True
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        coordinator = entry.runtime_data.device
+        await coordinator.async_refresh()
+        if not coordinator.stale:
+            raise RuntimeError(f"{entry.title} isn't stale after a failed poll")
+        push_source = PushSource()
+        await coordinator.async_set_transport(push_source)
+        push_source.push(
+            pywxm.WxmDevice.unmarshal(backend.device(coordinator.device_id))
+        )
+        await coordinator.async_set_transport(None)
+    backend.device_failures = False
+    await hass.async_block_till_done()
+    return [
+        state.entity_id
+        for state in hass.states.async_all()
+        if ATTR_STALE_SINCE in state.attributes
+    ]
+
+
+async def _async_soak(args: argparse.Namespace, clock: VirtualClock) -> int:
+    _patch_wall_clock(clock)
+    backend = FakeWeatherXm(clock, args.stations)
+    runner = web.AppRunner(backend.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    pywxm.api._BASE_URL = yarl.URL(f"http://127.0.0.1:{port}/api/v1")  # noqa: SLF001
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        # Load the integration from this repository as a custom integration.
+        repo_root = pathlib.Path(__file__).parent.parent
+        (pathlib.Path(config_dir) / "custom_components").symlink_to(
+            repo_root / "custom_components"
+        )
+        sys.path.insert(0, config_dir)
+
+        hass = await _async_setup_hass(pathlib.Path(config_dir))
+        metrics = Metrics()
+        metrics.async_listen(hass)
+        for device_id in backend.device_ids:
+            await _async_add_station(hass, device_id)
+        if args.forecast_subscriber:
+            _subscribe_forecasts(hass)
+
+        tracemalloc.start()
+        started = time.monotonic()
+        for hour in range(round(args.days * 24)):
+            await asyncio.sleep(3600)
+            # Replaced states are only freed by the cyclic garbage collector, so
+            # collect first to measure the memory which is actually retained.
+            gc.collect()
+            metrics.memory_samples.append(
+                (hour + 1, tracemalloc.get_traced_memory()[0])
+            )
+            if (hour + 1) % 24 == 0:
+                _LOGGER.info(
+                    "Simulated %d days in %.1f s",
+                    (hour + 1) // 24,
+                    time.monotonic() - started,
+                )
+        tracemalloc.stop()
+        metrics.entities_without_forecasts = await _async_entities_without_forecasts(
+            hass
+        )
+        metrics.entities_stale_after_push = await _async_entities_stale_after_push(
+            hass, backend
+        )
+
+        await hass.async_stop()
+    await runner.cleanup()
+
+    return _report(args, backend, metrics)
+
+
+def _report(args: argparse.Namespace, backend: FakeWeatherXm, metrics: Metrics) -> int:
+    """Print the results and return the number of budgets which were exceeded."""
+    stations, days = args.stations, args.days
+    errors: list[str] = []
+
+    print(f"Simulated {days} days with {stations} weather stations\n")  # noqa: T201
+    print(f"{'API endpoint':<35} {'Calls':>8} {'Budget':>8}")  # noqa: T201
+    for endpoint, calls in sorted(backend.calls.items()):
+        budget = _API_CALL_BUDGETS.get(endpoint, Budget(0, per_day=False))
+        limit = budget.scaled(stations, days)
+        print(f"{endpoint:<35} {calls:>8} {limit:>8.0f}")  # noqa: T201
+        if calls > limit:
+            errors.append(f"{endpoint} called {calls} times, budget {limit:.0f}")
+
+    checks = [
+        ("Entity state writes", metrics.state_writes, args.max_state_writes),
+        ("Entity state changes", metrics.state_changes, args.max_state_changes),
+        (
+            "Recorder events",
+            sum(metrics.recorder_events.values()),
+            args.max_recorder_events,
+        ),
+    ]
+    print()  # noqa: T201
+    for name, count, per_station_day in checks:
+        limit = per_station_day * stations * days
+        print(f"{name:<35} {count:>8} {limit:>8.0f}")  # noqa: T201
+        if count > limit:
+            errors.append(f"{name} was {count}, budget {limit:.0f}")
+    for event_type, count in metrics.recorder_events.most_common():
+        print(f"  {event_type:<33} {count:>8}")  # noqa: T201
+
+    growth_kib = metrics.memory_growth / 1024
+    print(  # noqa: T201
+        f"\n{'Memory growth (KiB)':<35} {growth_kib:>8.0f}"
+        f" {args.max_memory_growth_kib:>8.0f}"
+    )
+    if growth_kib > args.max_memory_growth_kib:
+        errors.append(f"Memory grew by {growth_kib:.0f} KiB")
+    for hours, memory in metrics.memory_samples[23::24]:
+        print(f"  After {hours / 24:.0f} days: {memory / 1024:.0f} KiB")  # noqa: T201
+
+    errors.extend(
+        f"{entity_id} had no hourly forecast"
+        for entity_id in metrics.entities_without_forecasts
+    )
+    errors.extend(
+        f"{entity_id} was still stale after a pushed update"
+        for entity_id in metrics.entities_stale_after_push
+    )
+
+    for error in errors:
+        print(f"::error ::{error}", file=sys.stderr)  # noqa: T201
+    return len(errors)
+
+
+parser = argparse.ArgumentParser("soak-test.py")
+parser.add_argument("--days", type=float, default=7, help="Simulated days to run for")
+parser.add_argument("--stations", type=int, default=3)
+parser.add_argument(
+    "--forecast-subscriber",
+    action="store_true",
+    help="Subscribe to forecasts for the whole run, like an open dashboard",
+)
+parser.add_argument(
+    "--max-state-writes",
+    type=float,
+    default=8000,
+    help="Budget for entity state writes per station per day",
+)
+parser.add_argument(
+    "--max-state-changes",
+    type=float,
+    default=6000,
+    help="Budget for entity state changes per station per day",
+)
+parser.add_argument(
+    "--max-recorder-events",
+    type=float,
+    default=6500,
+    help="Budget for events received by the recorder per station per day",
+)
+parser.add_argument(
+    "--max-memory-growth-kib",
+    type=float,
+    default=1024,
+    help="Budget for memory growth after the first day over the whole run",
+)
+parser.add_argument("--verbose", action="store_true")
+
+args = parser.parse_args()
+logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+logging.getLogger("homeassistant").setLevel(logging.WARNING)
+logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+clock = VirtualClock()
+loop = TimeWarpEventLoop(clock)
+asyncio.set_event_loop(loop)
+try:
+    sys.exit(loop.run_until_complete(_async_soak(args, clock)))
+finally:
+    loop.close()